@@ -9,7 +9,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from capture.window_detector import WindowDetector
-from capture.screen_capture import ScreenCapture, CaptureRegion
+from capture.screen_capture import ScreenCapture, CaptureRegion, scale_ratio_rects, PNG_FAST_PARAMS
 import cv2
 import numpy as np
 from pathlib import Path
@@ -31,25 +31,6 @@ def main():
     bounds = detector.get_window_bounds()
     x, y, width, height = bounds
     
-    # Initialize screen capture
-    screen_capture = ScreenCapture()
-    
-    # Capture full table
-    region = CaptureRegion(x=x, y=y, width=width, height=height, name="calibration")
-    image = screen_capture.capture_region(region)
-    
-    if image is None:
-        logger.error("Failed to capture screen")
-        return
-    
-    # Create output directory
-    output_dir = Path("calibration_output")
-    output_dir.mkdir(exist_ok=True)
-    
-    # Save original
-    cv2.imwrite(str(output_dir / "original.png"), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
-    logger.info(f"Saved original to calibration_output/original.png")
-    
     # Define test regions (percentages to try)
     test_configs = [
         # Current config
@@ -81,30 +62,64 @@ def main():
         }},
     ]
     
+    # Initialize screen capture
+    screen_capture = ScreenCapture()
+    
+    # Every seat of every test config lives inside the window, so one grab
+    # serves the whole calibration run
+    sub_regions = {
+        "original": CaptureRegion(x=x, y=y, width=width, height=height, name="calibration")
+    }
+    # Pixel rects for every seat of every config in one vectorized pass:
+    # (configs, seats, 4) indexed as seat_rects[config_index, seat_index]
+    seats = sorted(test_configs[0]["positions"])
+    all_ratios = np.array([[config["positions"][seat] for seat in seats] for config in test_configs])
+    seat_rects = scale_ratio_rects(all_ratios.reshape(-1, 4), x, y, width, height).reshape(all_ratios.shape)
+    
+    for ci, config in enumerate(test_configs):
+        for si, seat in enumerate(seats):
+            rx, ry, rw, rh = seat_rects[ci, si].tolist()
+            name = f"{config['name']}_seat{seat}"
+            sub_regions[name] = CaptureRegion(x=rx, y=ry, width=rw, height=rh, name=name)
+    
+    # Everything here goes straight to cv2.imwrite, so grab in OpenCV's BGR order
+    crops = screen_capture.capture_window_then_slice(bounds, sub_regions, bgr=True)
+    bgr = crops.get("original")
+    
+    if bgr is None:
+        logger.error("Failed to capture screen")
+        return
+    
+    # Create output directory
+    output_dir = Path("calibration_output")
+    output_dir.mkdir(exist_ok=True)
+    
+    # Save original
+    cv2.imwrite(str(output_dir / "original.png"), bgr, PNG_FAST_PARAMS)
+    logger.info(f"Saved original to calibration_output/original.png")
+    
     # Test each configuration
-    for config in test_configs:
-        overlay = image.copy()
+    for ci, config in enumerate(test_configs):
+        overlay = bgr.copy()
         
         # Draw regions
-        for seat, (px, py, pw, ph) in config["positions"].items():
-            rx = int(px * width)
-            ry = int(py * height)
-            rw = int(pw * width)
-            rh = int(ph * height)
+        for si, seat in enumerate(seats):
+            name = f"{config['name']}_seat{seat}"
+            rx, ry, rw, rh = seat_rects[ci, si].tolist()
+            rx -= x
+            ry -= y
             
             # Draw rectangle
             cv2.rectangle(overlay, (rx, ry), (rx + rw, ry + rh), (0, 255, 0), 2)
             cv2.putText(overlay, f"Seat {seat}", (rx, ry - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
             
-            # Extract and save region
-            region_img = image[ry:ry+rh, rx:rx+rw]
-            cv2.imwrite(str(output_dir / f"{config['name']}_seat{seat}.png"), 
-                       cv2.cvtColor(region_img, cv2.COLOR_RGB2BGR))
+            # Save the region, sliced out of the single window grab
+            if name in crops:
+                cv2.imwrite(str(output_dir / f"{name}.png"), crops[name], PNG_FAST_PARAMS)
         
         # Save overlay
-        cv2.imwrite(str(output_dir / f"{config['name']}_overlay.png"), 
-                   cv2.cvtColor(overlay, cv2.COLOR_RGB2BGR))
+        cv2.imwrite(str(output_dir / f"{config['name']}_overlay.png"), overlay, PNG_FAST_PARAMS)
         logger.info(f"Saved {config['name']} configuration")
     
     logger.info("\nCalibration complete!")
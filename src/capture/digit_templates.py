@@ -0,0 +1,147 @@
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+
+# Template file stem -> character it represents
+_TEMPLATE_NAMES = {str(d): str(d) for d in range(10)}
+_TEMPLATE_NAMES["dollar"] = "$"
+
+# Glyphs are compared at this fixed (width, height)
+GLYPH_SIZE = (16, 24)
+
+
+def segment_glyphs(image: np.ndarray, min_area: int = 2) -> List[Tuple[int, int, int, int, np.ndarray]]:
+    """
+    Split a single line of rendered text into per-character glyphs
+    
+    Args:
+        image: RGB or grayscale crop of a stack/pot label
+        min_area: Components smaller than this are treated as noise
+    
+    Returns:
+        (x, y, width, height, binary glyph) tuples sorted left to right
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    
+    # Text is the minority class whether the client draws light-on-dark or not
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    glyphs = []
+    for x, y, w, h, area in stats[1:count].tolist():
+        if area >= min_area:
+            glyphs.append((x, y, w, h, binary[y:y + h, x:x + w]))
+    
+    glyphs.sort(key=lambda g: g[0])
+    return glyphs
+
+
+class DigitMatcher:
+    """Recognizes stack/pot amounts drawn in one fixed client font by template matching"""
+    
+    def __init__(self, templates: Dict[str, np.ndarray], max_score: float = 0.25):
+        """
+        Args:
+            templates: Character -> binary glyph image (text white on black)
+            max_score: Worst normalized squared difference accepted for a glyph
+        """
+        if not templates:
+            raise ValueError("DigitMatcher needs at least one template")
+        
+        self.max_score = max_score
+        self.chars = list(templates)
+        # (N, H*W) float stack so one glyph is scored against every template at once
+        self._bank = np.stack([self._normalize(t).ravel() for t in templates.values()])
+        self._bank_energy = np.einsum("ij,ij->i", self._bank, self._bank)
+    
+    @classmethod
+    def from_directory(cls, directory: str, max_score: float = 0.25) -> "DigitMatcher":
+        """
+        Load templates saved as 0.png..9.png and dollar.png
+        
+        Templates are white text on black, as cut from calibration_output/
+        crops by segment_glyphs.
+        Decimal points and commas are recognized by size, not by template.
+        """
+        templates = {}
+        for path in sorted(Path(directory).glob("*.png")):
+            char = _TEMPLATE_NAMES.get(path.stem)
+            if char is None:
+                continue
+            glyph = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+            if glyph is None:
+                logger.warning(f"Could not read digit template {path}")
+                continue
+            # Tight glyph crops can be mostly ink, so polarity isn't guessed here
+            _, templates[char] = cv2.threshold(glyph, 127, 255, cv2.THRESH_BINARY)
+        
+        logger.info(f"Loaded {len(templates)} digit templates from {directory}")
+        return cls(templates, max_score)
+    
+    @staticmethod
+    def _normalize(glyph: np.ndarray) -> np.ndarray:
+        """Resize a glyph to GLYPH_SIZE as float32 in [0, 1]"""
+        resized = cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+        return resized.astype(np.float32) / 255.0
+    
+    def match_glyph(self, glyph: np.ndarray) -> Tuple[str, float]:
+        """Best template for one glyph as (character, TM_SQDIFF_NORMED score)"""
+        sample = self._normalize(glyph).ravel()
+        # Same formula cv2.matchTemplate uses for TM_SQDIFF_NORMED on equal-size inputs
+        diff = self._bank - sample
+        sqdiff = np.einsum("ij,ij->i", diff, diff)
+        energy = float(sample @ sample)
+        scores = sqdiff / np.sqrt(self._bank_energy * energy + 1e-12)
+        
+        best = int(np.argmin(scores))
+        return self.chars[best], float(scores[best])
+    
+    def read(self, image: np.ndarray) -> Optional[str]:
+        """
+        Read an amount such as "$12.34" from a crop
+        
+        Returns:
+            The recognized string, or None when any glyph is too far from every
+            template (callers should fall back to tesseract)
+        """
+        glyphs = segment_glyphs(image)
+        if not glyphs:
+            return None
+        
+        # Separators are much shorter than digits; tell them apart by geometry
+        # rather than stretching a dot to GLYPH_SIZE
+        line_height = max(h for _, _, _, h, _ in glyphs)
+        # Median bottom edge, so a descending "$" doesn't drag the baseline down
+        baseline = int(np.median([y + h for _, y, _, h, _ in glyphs if h > line_height // 2]))
+        
+        chars = []
+        for _, y, _, h, glyph in glyphs:
+            if h <= line_height // 2:
+                if y + h > baseline + 1:
+                    continue  # Thousands comma dips below the baseline
+                if y + h >= baseline - 1:
+                    chars.append(".")
+                continue
+            
+            char, score = self.match_glyph(glyph)
+            if score > self.max_score:
+                return None
+            chars.append(char)
+        
+        return "".join(chars)
+    
+    def read_number(self, image: np.ndarray) -> Optional[float]:
+        """Read an amount and parse it, ignoring currency symbols"""
+        text = self.read(image)
+        if not text:
+            return None
+        
+        try:
+            return float(text.replace("$", ""))
+        except ValueError:
+            return None
@@ -1,12 +1,248 @@
+import os
 import cv2
 import numpy as np
 import pytesseract
 from PIL import Image
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 import re
+import queue
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
 from loguru import logger
 from dataclasses import dataclass
 
+from capture.digit_templates import DigitMatcher
+
+# tesserocr is imported by _load_tesserocr, only when a tesserocr engine is used
+PyTessBaseAPI = PSM = OEM = RIL = iterate_level = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels below still run as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Tesseract CLI options understood by the in-process tesserocr backend
+_PSM_RE = re.compile(r"--psm\s+(\d+)")
+_WHITELIST_RE = re.compile(r"tessedit_char_whitelist=(\S+)")
+
+# Extraction patterns, compiled once at import instead of per call
+_NUMBER_RE = re.compile(r'[\d.]+')
+_AMOUNT_RE = re.compile(r'[\d,]+\.?\d*')
+_CARD_RE = re.compile(r'[AKQJT2-9][schd]')
+_USERNAME_STRIP_RE = re.compile(r'[^A-Za-z0-9_\-]')
+_ALNUM_RE = re.compile(r'[A-Za-z0-9]')
+
+# Common OCR misreads that look like system text, fused into a single scan
+_GARBAGE_RE = re.compile(
+    r'^(?:error|info|debug)|window|poker|found|updated|session|detected',
+    re.IGNORECASE
+)
+
+# All HUD stats in one alternation so the OCR text is scanned once; group
+# names are the stat keys, except "3bet" which isn't a valid group name
+_HUD_RE = re.compile(
+    r"(?:VPIP|VP)[:\s]*(?P<vpip>[\d.]+)"
+    r"|(?:PFR|PR)[:\s]*(?P<pfr>[\d.]+)"
+    r"|(?:F3B|Fold3B)[:\s]*(?P<fold_3bet>[\d.]+)"
+    r"|(?:3B|3bet)[:\s]*(?P<three_bet>[\d.]+)"
+    r"|(?:CB|Cbet)[:\s]*(?P<cbet>[\d.]+)"
+    r"|(?:AF|Agg)[:\s]*(?P<af>[\d.]+)"
+    r"|(?:WTSD|WtSD)[:\s]*(?P<wtsd>[\d.]+)"
+    r"|(?:WWSF|W\$SF)[:\s]*(?P<wwsf>[\d.]+)",
+    re.IGNORECASE
+)
+_HUD_GROUP_STATS = {"three_bet": "3bet"}
+
+# Tesseract configs, built once instead of per call
+_MONEY_CONFIG = "--psm 8 -c tessedit_char_whitelist=0123456789.$,"
+_CARDS_CONFIG = "--psm 8 -c tessedit_char_whitelist=AKQJT23456789schd"
+_USERNAME_CONFIGS = tuple(
+    f"--psm {psm} -c tessedit_char_whitelist="
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+    for psm in (8, 7, 11)  # Single line, text line, sparse text
+)
+
+# Words tesseract scores below this are almost always noise on table regions
+_MIN_WORD_CONFIDENCE = 40
+
+# Region type -> (preprocessing operations, tesseract config)
+_REGION_PROFILES = {
+    # High contrast for card detection
+    "cards": (["grayscale", "threshold", "resize"], _CARDS_CONFIG),
+    # Optimize for numbers and currency
+    "money": (["grayscale", "adaptive_threshold", "denoise"], _MONEY_CONFIG),
+    # Balance for mixed text and numbers
+    "hud": (["grayscale", "threshold", "denoise"], "--psm 6"),
+    # Less aggressive preprocessing for text
+    "username": (["grayscale", "denoise"], "--psm 8"),
+}
+
+
+def _image_digest(image: np.ndarray):
+    """Cheap content hash of an image buffer (xxh3 when available)"""
+    data = memoryview(np.ascontiguousarray(image)).cast("B")
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _aligned_empty(shape: Tuple[int, ...], dtype, align: int = 64) -> np.ndarray:
+    """
+    Uninitialised array whose base and every row start on an `align`-byte boundary
+    
+    Rows are padded out to a whole number of cache lines so buffers written by
+    different worker threads never share a line (no false sharing).
+    """
+    dtype = np.dtype(dtype)
+    if len(shape) < 2:
+        raw = np.empty(int(np.prod(shape)) * dtype.itemsize + align, np.uint8)
+        offset = -raw.ctypes.data % align
+        return raw[offset:offset + int(np.prod(shape)) * dtype.itemsize].view(dtype).reshape(shape)
+    
+    rows, cols, rest = shape[0], shape[1], tuple(shape[2:])
+    pixel_bytes = int(np.prod(rest, dtype=np.int64)) * dtype.itemsize
+    # Smallest column count step that keeps a row a multiple of `align` bytes
+    col_step = align // math.gcd(align, pixel_bytes)
+    padded_cols = -(-cols // col_step) * col_step
+    row_bytes = padded_cols * pixel_bytes
+    
+    raw = np.empty(rows * row_bytes + align, np.uint8)
+    offset = -raw.ctypes.data % align
+    padded = raw[offset:offset + rows * row_bytes].view(dtype).reshape((rows, padded_cols) + rest)
+    return padded[:, :cols]
+
+
+@lru_cache(maxsize=None)
+def _parse_tesseract_config(config: str) -> Tuple[int, str]:
+    """Split a tesseract CLI config string into (page segmentation mode, whitelist)"""
+    psm_match = _PSM_RE.search(config)
+    whitelist_match = _WHITELIST_RE.search(config)
+    return (int(psm_match.group(1)) if psm_match else PSM.AUTO,
+            whitelist_match.group(1) if whitelist_match else "")
+
+
+@njit(nogil=True, cache=True, fastmath=True)
+def _illumination_compensation(gray, radius, out):
+    """Flatten uneven lighting by scaling each pixel by global / local mean brightness"""
+    height, width = gray.shape
+    
+    # Summed-area table so each local mean is O(1)
+    integral = np.zeros((height + 1, width + 1), np.float64)
+    for y in range(height):
+        row_sum = 0.0
+        for x in range(width):
+            row_sum += gray[y, x]
+            integral[y + 1, x + 1] = integral[y, x + 1] + row_sum
+    
+    global_mean = integral[height, width] / (height * width)
+    
+    for y in range(height):
+        y0 = max(0, y - radius)
+        y1 = min(height, y + radius + 1)
+        for x in range(width):
+            x0 = max(0, x - radius)
+            x1 = min(width, x + radius + 1)
+            local_sum = (integral[y1, x1] - integral[y0, x1]
+                         - integral[y1, x0] + integral[y0, x0])
+            local_mean = max(local_sum / ((y1 - y0) * (x1 - x0)), 1.0)
+            out[y, x] = min(gray[y, x] * global_mean / local_mean, 255.0)
+    
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) at import rather than on the first frame
+    # Scratch buffers are row-padded views, which numba types as a separate layout
+    for _src in (np.zeros((1, 1), np.uint8), _aligned_empty((1, 1), np.uint8)):
+        for _dst in (np.empty((1, 1), np.uint8), _aligned_empty((1, 1), np.uint8)):
+            _src[:] = 0
+            _illumination_compensation(_src, 1, _dst)
+
+
+def downscale_to(image: np.ndarray, max_dim: int) -> np.ndarray:
+    """Shrink an image so its longer side is at most max_dim; smaller images pass through"""
+    height, width = image.shape[:2]
+    scale = max_dim / max(height, width)
+    if scale >= 1.0:
+        return image
+    size = (max(int(width * scale), 1), max(int(height * scale), 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def _load_tesserocr() -> bool:
+    """Import tesserocr on first use; False when it isn't installed"""
+    global PyTessBaseAPI, PSM, OEM, RIL, iterate_level
+    if PyTessBaseAPI is None:
+        # Tesseract's internal OpenMP threads fight with our own worker threads
+        # on small seat crops. The limit is read when libtesseract's OpenMP
+        # runtime loads, so it has to be set before the import - which also
+        # means it applies process-wide once a tesserocr engine is chosen
+        preset = "OMP_THREAD_LIMIT" in os.environ
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        try:
+            from tesserocr import PyTessBaseAPI, PSM, OEM, RIL, iterate_level
+        except ImportError:
+            if not preset:
+                del os.environ["OMP_THREAD_LIMIT"]
+            return False
+    return True
+
+
+def _new_tesseract_api(config: str) -> "PyTessBaseAPI":
+    """Create a libtesseract handle preconfigured for a config string"""
+    # Spawned worker processes start with the module freshly imported
+    _load_tesserocr()
+    psm, whitelist = _parse_tesseract_config(config)
+    api = PyTessBaseAPI(psm=psm, oem=OEM.LSTM_ONLY)
+    if whitelist:
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+    return api
+
+
+# Per-process state for the "tesserocr-mp" engine's worker processes
+_WORKER_APIS: Dict[str, "PyTessBaseAPI"] = {}
+
+
+def _recognize_shared(segment: str, shape: Tuple[int, ...], dtype: str, config: str) -> Tuple[str, int]:
+    """Worker-process entry point: OCR an image the parent left in shared memory"""
+    # Copy the pixels out and detach straight away, so a worker never keeps
+    # the parent's blocks mapped between calls
+    shm = shared_memory.SharedMemory(name=segment)
+    try:
+        image = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        pixels, stride = image.tobytes(), image.strides[0]
+        del image  # The view must go before the mapping can close
+    finally:
+        shm.close()
+    
+    api = _WORKER_APIS.get(config)
+    if api is None:
+        api = _WORKER_APIS[config] = _new_tesseract_api(config)
+    
+    height, width = shape[:2]
+    bytes_per_pixel = 1 if len(shape) == 2 else shape[2]
+    api.SetImageBytes(pixels, width, height, bytes_per_pixel, stride)
+    api.Recognize()
+    return api.GetUTF8Text(), api.MeanTextConf()
+
 
 @dataclass
 class OCRResult:
@@ -17,24 +253,128 @@ class OCRResult:
     processed_image: Optional[np.ndarray] = None
 
 
+@dataclass(frozen=True)
+class OCRWord:
+    """A single recognized word with its box in source-image pixels"""
+    text: str
+    confidence: float
+    x: int
+    y: int
+    width: int
+    height: int
+    line: int = 0  # Words sharing a line number belong to the same text line
+
+
+@dataclass
+class PreprocessedRegion:
+    """One region preprocessed once, with views shared by every extractor"""
+    image: np.ndarray        # Original capture
+    gray: np.ndarray
+    binary: np.ndarray       # Otsu-thresholded gray
+    processed: np.ndarray    # Default preprocessing pipeline output
+    upscaled: Optional[np.ndarray] = None  # 2x binary for cards, built on first use
+
+
+# Extractors accept a raw capture or a region already run through preprocess_once
+ImageInput = Union[np.ndarray, PreprocessedRegion]
+
+
 class OCREngine:
     """Handles OCR operations for extracting text from poker table images"""
     
-    def __init__(self, engine: str = "pytesseract"):
+    def __init__(self, engine: str = "pytesseract", max_workers: Optional[int] = None,
+                 cache_size: int = 512, digit_templates: Optional[str] = None):
+        if engine in ("tesserocr", "tesserocr-mp") and not _load_tesserocr():
+            logger.warning("tesserocr not installed, falling back to pytesseract")
+            engine = "pytesseract"
+        
         self.engine = engine
         self.config = self._get_default_config()
         self.preprocessing_pipeline = ["grayscale", "threshold", "denoise"]
         
+        # Preprocessing scratch buffers are per-thread since batch_extract is threaded
+        self._local = threading.local()
+        self._kernel = np.ones((2, 2), np.uint8)
+        
+        # Tesseract already uses ~4 cores per recognition, so don't oversubscribe
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 4) // 4)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="ocr")
+        
+        # Persistent libtesseract handles - avoids spawning the tesseract CLI per
+        # call. Pooled per config string so each handle has its PSM/whitelist set
+        # exactly once; a pool grows lazily to max_workers since an API isn't
+        # thread-safe
+        self._api_pools: Dict[str, queue.Queue] = {}
+        self._api_counts: Dict[str, int] = {}
+        self._api_lock = threading.Lock()
+        if self.engine == "tesserocr":
+            for config in {self.config, *(c for _, c in _REGION_PROFILES.values())}:
+                self._release_api(config, self._create_api(config))
+                self._api_counts[config] = 1
+        
+        # "tesserocr-mp" runs recognition in worker processes for table counts
+        # where threads plateau. Images cross the process boundary through
+        # reusable shared-memory blocks, so only (name, shape, dtype) is pickled
+        self._process_pool = None
+        self._free_segments: List[shared_memory.SharedMemory] = []
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._segment_lock = threading.Lock()
+        if self.engine == "tesserocr-mp":
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        
+        # Recent OCR results keyed by preprocessed image hash + config; a static
+        # table yields identical crops between actions, so these skip OCR entirely
+        self.cache_size = cache_size
+        self._ocr_cache: "OrderedDict[tuple, OCRResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Preprocessing operation -> (op(src, dst), output shape from input shape);
+        # operation lists are compiled into tuples of these by _pipeline
+        kernel = self._kernel
+        same_shape = lambda shape: shape
+        self._op_table = {
+            "grayscale": (lambda src, dst: cv2.cvtColor(src, cv2.COLOR_RGB2GRAY, dst=dst),
+                          lambda shape: shape[:2]),
+            "threshold": (lambda src, dst: cv2.threshold(
+                              src, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=dst)[1],
+                          same_shape),
+            "adaptive_threshold": (lambda src, dst: cv2.adaptiveThreshold(
+                                       src, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY, 11, 2, dst=dst),
+                                   same_shape),
+            "denoise": (lambda src, dst: cv2.medianBlur(src, 3, dst=dst), same_shape),
+            # Compensate for dim avatars / vignetting before thresholding
+            "illum": (lambda src, dst: _illumination_compensation(src, 15, dst), same_shape),
+            "dilate": (lambda src, dst: cv2.dilate(src, kernel, dst=dst, iterations=1), same_shape),
+            "erode": (lambda src, dst: cv2.erode(src, kernel, dst=dst, iterations=1), same_shape),
+            "invert": (lambda src, dst: cv2.bitwise_not(src, dst=dst), same_shape),
+            # Upscale for better OCR
+            "resize": (lambda src, dst: cv2.resize(src, (dst.shape[1], dst.shape[0]), dst=dst,
+                                                   interpolation=cv2.INTER_CUBIC),
+                       lambda shape: (shape[0] * 2, shape[1] * 2) + shape[2:]),
+        }
+        self._pipelines: Dict[tuple, Tuple[tuple, ...]] = {}
+        
+        # Template matcher for amounts drawn in the client's fixed font; tesseract
+        # is only consulted when a glyph doesn't match any template
+        self.digit_matcher = None
+        if digit_templates:
+            try:
+                self.digit_matcher = DigitMatcher.from_directory(digit_templates)
+            except ValueError as e:
+                logger.warning(f"Digit templates unavailable, using tesseract for amounts: {e}")
+        
         # Regex patterns for poker-specific text
         self.patterns = {
-            "money": r"[\$€£]?[\d,]+\.?\d*",
-            "cards": r"[AKQJT2-9][schd]",
-            "action": r"(fold|check|call|bet|raise|all-in)",
-            "vpip": r"VPIP:\s*([\d.]+)%?",
-            "pfr": r"PFR:\s*([\d.]+)%?",
-            "3bet": r"3bet:\s*([\d.]+)%?",
-            "username": r"[A-Za-z0-9_]+",
-            "percentage": r"([\d.]+)%"
+            "money": re.compile(r"[\$€£]?[\d,]+\.?\d*"),
+            "cards": _CARD_RE,
+            "action": re.compile(r"(fold|check|call|bet|raise|all-in)"),
+            "vpip": re.compile(r"VPIP:\s*([\d.]+)%?"),
+            "pfr": re.compile(r"PFR:\s*([\d.]+)%?"),
+            "3bet": re.compile(r"3bet:\s*([\d.]+)%?"),
+            "username": re.compile(r"[A-Za-z0-9_]+"),
+            "percentage": re.compile(r"([\d.]+)%")
         }
         
         logger.info(f"OCREngine initialized with {engine}")
@@ -43,54 +383,87 @@ class OCREngine:
         """Get default Tesseract configuration"""
         return "--oem 3 --psm 11 -c tessedit_char_whitelist=0123456789AKQJTschd$.,%()/- "
     
+    def _scratch(self, shape: Tuple[int, ...], dtype: np.dtype, slot: int) -> np.ndarray:
+        """Get a reusable per-thread buffer for intermediate preprocessing stages"""
+        buffers = self._local.__dict__.setdefault("buffers", {})
+        key = (shape, dtype, slot)
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = _aligned_empty(shape, dtype)
+        return buffer
+    
+    def _plan_operations(self, ndim: int, operations: List[str]) -> List[str]:
+        """Resolve which operations will actually run for an image of this rank"""
+        steps = []
+        for op in operations:
+            if op == "grayscale":
+                if ndim == 3:
+                    steps.append(op)
+                    ndim = 2
+            elif op in ("threshold", "adaptive_threshold", "denoise", "illum"):
+                if ndim == 2:  # Ensure grayscale
+                    steps.append(op)
+            elif op in ("dilate", "erode", "invert", "resize"):
+                steps.append(op)
+        return steps
+    
+    def _pipeline(self, ndim: int, operations: List[str]) -> Tuple[tuple, ...]:
+        """Compiled (op, output shape) steps for an operation list, built once per rank"""
+        key = (ndim, tuple(operations))
+        steps = self._pipelines.get(key)
+        if steps is None:
+            steps = self._pipelines[key] = tuple(
+                self._op_table[op] for op in self._plan_operations(ndim, operations)
+            )
+        return steps
+    
     def preprocess_image(self, image: np.ndarray, operations: List[str] = None) -> np.ndarray:
         """Apply preprocessing operations to improve OCR accuracy"""
         if operations is None:
             operations = self.preprocessing_pipeline
         
-        processed = image.copy()
+        # Intermediate stages write into ping-pong scratch buffers; only the final
+        # stage allocates, so the returned array is never clobbered by a later call
+        steps = self._pipeline(image.ndim, operations)
+        processed = image
         
-        for op in operations:
-            if op == "grayscale":
-                if len(processed.shape) == 3:
-                    processed = cv2.cvtColor(processed, cv2.COLOR_RGB2GRAY)
-            
-            elif op == "threshold":
-                if len(processed.shape) == 2:  # Ensure grayscale
-                    _, processed = cv2.threshold(processed, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            elif op == "adaptive_threshold":
-                if len(processed.shape) == 2:
-                    processed = cv2.adaptiveThreshold(processed, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                                    cv2.THRESH_BINARY, 11, 2)
-            
-            elif op == "denoise":
-                if len(processed.shape) == 2:
-                    processed = cv2.medianBlur(processed, 3)
-            
-            elif op == "dilate":
-                kernel = np.ones((2, 2), np.uint8)
-                processed = cv2.dilate(processed, kernel, iterations=1)
-            
-            elif op == "erode":
-                kernel = np.ones((2, 2), np.uint8)
-                processed = cv2.erode(processed, kernel, iterations=1)
-            
-            elif op == "invert":
-                processed = cv2.bitwise_not(processed)
-            
-            elif op == "resize":
-                # Upscale for better OCR
-                processed = cv2.resize(processed, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        for i, (op, output_shape) in enumerate(steps):
+            shape = output_shape(processed.shape)
+            if i == len(steps) - 1:
+                dst = np.empty(shape, processed.dtype)
+            else:
+                dst = self._scratch(shape, processed.dtype, i % 2)
+            processed = op(processed, dst)
         
         return processed
     
-    def extract_text(self, image: np.ndarray, preprocess: bool = True, 
+    def preprocess_once(self, image: np.ndarray) -> PreprocessedRegion:
+        """Grayscale and binarize a region once so several extractors can share it"""
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        
+        if self.preprocessing_pipeline == ["grayscale", "threshold", "denoise"]:
+            processed = cv2.medianBlur(binary, 3)
+        else:
+            processed = self.preprocess_image(image)
+        
+        return PreprocessedRegion(image=image, gray=gray, binary=binary, processed=processed)
+    
+    def _upscaled(self, region: PreprocessedRegion) -> np.ndarray:
+        """2x upscaled binary view of a region, computed at most once"""
+        if region.upscaled is None:
+            region.upscaled = cv2.resize(region.binary, None, fx=2, fy=2,
+                                         interpolation=cv2.INTER_CUBIC)
+        return region.upscaled
+    
+    def extract_text(self, image: ImageInput, preprocess: bool = True, 
                     custom_config: str = None) -> OCRResult:
         """Extract text from image using OCR"""
         try:
             # Preprocess image if requested
-            if preprocess:
+            if isinstance(image, PreprocessedRegion):
+                processed_image = image.processed if preprocess else image.image
+            elif preprocess:
                 processed_image = self.preprocess_image(image)
             else:
                 processed_image = image
@@ -98,42 +471,241 @@ class OCREngine:
             # Use custom config if provided
             config = custom_config or self.config
             
+            # Hash the preprocessed image so sensor noise that thresholds away
+            # doesn't bust the cache
+            cache_key = (_image_digest(processed_image), processed_image.shape, config)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Perform OCR
             if self.engine == "pytesseract":
                 # Get detailed results with confidence scores
                 data = pytesseract.image_to_data(processed_image, config=config, output_type=pytesseract.Output.DICT)
                 
-                # Filter and combine text with confidence
-                texts = []
-                confidences = []
-                
-                for i in range(len(data['text'])):
-                    if int(data['conf'][i]) > 0:  # Valid detection
-                        texts.append(data['text'][i])
-                        confidences.append(int(data['conf'][i]))
-                
-                text = ' '.join(texts)
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+                # Keep confident, non-empty words and average as we go
+                parts = []
+                conf_sum = 0.0
+                for word, conf in zip(data['text'], data['conf']):
+                    conf = float(conf)
+                    if conf >= _MIN_WORD_CONFIDENCE and word:
+                        parts.append(word)
+                        conf_sum += conf
                 
-                return OCRResult(
-                    text=text.strip(),
-                    confidence=avg_confidence / 100,  # Convert to 0-1 scale
-                    processed_image=processed_image
-                )
+                text = ' '.join(parts)
+                avg_confidence = conf_sum / len(parts) if parts else 0
+            
+            elif self.engine == "tesserocr":
+                text, avg_confidence = self._recognize_tesserocr(processed_image, config)
+            
+            elif self.engine == "tesserocr-mp":
+                text, avg_confidence = self._recognize_multiprocess(processed_image, config)
             
             else:
                 # Placeholder for other OCR engines (easyocr, etc.)
                 logger.warning(f"OCR engine {self.engine} not fully implemented")
                 return OCRResult(text="", confidence=0.0)
+            
+            result = OCRResult(
+                text=text.strip(),
+                confidence=avg_confidence / 100,  # Convert to 0-1 scale
+                processed_image=processed_image
+            )
+            self._cache_put(cache_key, result)
+            return result
                 
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
             return OCRResult(text="", confidence=0.0)
     
-    def extract_number(self, image: np.ndarray, is_money: bool = False) -> Optional[float]:
+    def extract_text_with_boxes(self, image: np.ndarray, preprocess: bool = True,
+                                custom_config: str = None,
+                                max_dim: Optional[int] = None,
+                                min_confidence: float = 0.0) -> List[OCRWord]:
+        """
+        OCR a whole image once and return every word with its bounding box
+        
+        Boxes are in the coordinates of `image`, so callers can bucket words
+        into their own region rectangles instead of OCRing each region. With
+        max_dim, large (high-DPI) images are shrunk first since OCR time grows
+        with pixel count. Words with confidence (0-1) below min_confidence are
+        dropped here, so one bad word never costs a whole region.
+        """
+        try:
+            source = downscale_to(image, max_dim) if max_dim else image
+            processed_image = self.preprocess_image(source) if preprocess else source
+            config = custom_config or self.config
+            
+            cache_key = (_image_digest(processed_image), processed_image.shape, config,
+                         "words", min_confidence)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return list(cached)
+            
+            # Map boxes back if preprocessing resized the image
+            scale_x = image.shape[1] / processed_image.shape[1]
+            scale_y = image.shape[0] / processed_image.shape[0]
+            
+            if self.engine == "pytesseract":
+                data = pytesseract.image_to_data(processed_image, config=config,
+                                                 output_type=pytesseract.Output.DICT)
+                # Word rows above the confidence floor, selected in one NumPy pass
+                conf = np.asarray(data['conf'], dtype=np.float32)
+                keep = (np.asarray(data['level']) == 5) & (conf >= min_confidence * 100)
+                
+                words = []
+                line_ids = {}
+                for i in np.flatnonzero(keep).tolist():
+                    text = data['text'][i]
+                    if not text.strip():
+                        continue
+                    line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+                    words.append((text, float(conf[i]), data['left'][i], data['top'][i],
+                                  data['width'][i], data['height'][i],
+                                  line_ids.setdefault(line, len(line_ids))))
+            elif self.engine in ("tesserocr", "tesserocr-mp"):
+                words = self._recognize_words_tesserocr(processed_image, config, min_confidence * 100)
+            else:
+                logger.warning(f"OCR engine {self.engine} not fully implemented")
+                return []
+            
+            result = tuple(
+                OCRWord(text=text, confidence=conf / 100,
+                        x=int(x * scale_x), y=int(y * scale_y),
+                        width=int(w * scale_x), height=int(h * scale_y), line=line)
+                for text, conf, x, y, w, h, line in words
+            )
+            self._cache_put(cache_key, result)
+            return list(result)
+            
+        except Exception as e:
+            logger.error(f"OCR word extraction failed: {e}")
+            return []
+    
+    def _cache_get(self, key: tuple):
+        """Look up a cached OCR result, returning a copy callers may mutate"""
+        with self._cache_lock:
+            result = self._ocr_cache.get(key)
+            if result is None:
+                return None
+            self._ocr_cache.move_to_end(key)
+        # Word tuples are immutable; only OCRResult needs copying
+        return replace(result) if isinstance(result, OCRResult) else result
+    
+    def _cache_put(self, key: tuple, result):
+        """Store an OCR result, evicting the least recently used entry when full"""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._ocr_cache[key] = replace(result) if isinstance(result, OCRResult) else result
+            if len(self._ocr_cache) > self.cache_size:
+                self._ocr_cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Drop cached OCR results, e.g. after the table layout changes"""
+        with self._cache_lock:
+            self._ocr_cache.clear()
+    
+    def _create_api(self, config: str) -> "PyTessBaseAPI":
+        """Create a libtesseract handle preconfigured for a config string"""
+        return _new_tesseract_api(config)
+    
+    def _acquire_api(self, config: str) -> "PyTessBaseAPI":
+        """Check out a handle for this config, creating one if the pool is not full"""
+        with self._api_lock:
+            pool = self._api_pools.setdefault(config, queue.Queue())
+            if pool.empty() and self._api_counts.get(config, 0) < self.max_workers:
+                self._api_counts[config] = self._api_counts.get(config, 0) + 1
+                return self._create_api(config)
+        return pool.get()
+    
+    def _release_api(self, config: str, api: "PyTessBaseAPI"):
+        """Return a handle to its config's pool"""
+        self._api_pools.setdefault(config, queue.Queue()).put(api)
+    
+    def _recognize_tesserocr(self, image: np.ndarray, config: str) -> Tuple[str, int]:
+        """Run a pooled tesserocr API directly on a numpy buffer"""
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        
+        api = self._acquire_api(config)
+        try:
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+            api.Recognize()
+            
+            return api.GetUTF8Text(), api.MeanTextConf()
+        finally:
+            self._release_api(config, api)
+    
+    def _recognize_words_tesserocr(self, image: np.ndarray, config: str,
+                                   min_conf: float = 0.0) -> List[tuple]:
+        """Word-level (text, conf, x, y, w, h, line) tuples from a pooled tesserocr API"""
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        
+        api = self._acquire_api(config)
+        try:
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+            api.Recognize()
+            
+            words = []
+            line = 0
+            for it in iterate_level(api.GetIterator(), RIL.WORD):
+                if it.IsAtBeginningOf(RIL.TEXTLINE):
+                    line += 1
+                conf = it.Confidence(RIL.WORD)
+                if conf < min_conf:
+                    continue
+                text = it.GetUTF8Text(RIL.WORD)
+                if not text or not text.strip():
+                    continue
+                x1, y1, x2, y2 = it.BoundingBox(RIL.WORD)
+                words.append((text, conf, x1, y1, x2 - x1, y2 - y1, line))
+            return words
+        finally:
+            self._release_api(config, api)
+    
+    def _acquire_segment(self, nbytes: int) -> shared_memory.SharedMemory:
+        """Check out a shared-memory block of at least nbytes"""
+        with self._segment_lock:
+            for i, shm in enumerate(self._free_segments):
+                if shm.size >= nbytes:
+                    return self._free_segments.pop(i)
+            # Round up to a power of two (min 64KB) so blocks get reused across sizes
+            size = max(1 << 16, 1 << (nbytes - 1).bit_length())
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._segments.append(shm)
+            return shm
+    
+    def _release_segment(self, shm: shared_memory.SharedMemory):
+        """Return a block to the free list"""
+        with self._segment_lock:
+            self._free_segments.append(shm)
+    
+    def _recognize_multiprocess(self, image: np.ndarray, config: str) -> Tuple[str, int]:
+        """Copy an image into shared memory and OCR it in a worker process"""
+        image = np.ascontiguousarray(image)
+        shm = self._acquire_segment(image.nbytes)
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+            future = self._process_pool.submit(_recognize_shared, shm.name, image.shape,
+                                               image.dtype.str, config)
+            return future.result()
+        finally:
+            self._release_segment(shm)
+    
+    def extract_number(self, image: ImageInput, is_money: bool = False) -> Optional[float]:
         """Extract numerical value from image"""
+        if self.digit_matcher is not None:
+            gray = image.gray if isinstance(image, PreprocessedRegion) else image
+            value = self.digit_matcher.read_number(gray)
+            if value is not None:
+                return value
+        
         result = self.extract_text(image, preprocess=True, 
-                                  custom_config="--psm 8 -c tessedit_char_whitelist=0123456789.$,")
+                                  custom_config=_MONEY_CONFIG)
         
         if result.confidence < 0.5:
             return None
@@ -145,7 +717,7 @@ class OCREngine:
             return float(text)
         except ValueError:
             # Try to find number pattern
-            match = re.search(r'[\d.]+', text)
+            match = _NUMBER_RE.search(text)
             if match:
                 try:
                     return float(match.group())
@@ -154,20 +726,23 @@ class OCREngine:
         
         return None
     
-    def extract_cards(self, image: np.ndarray) -> List[str]:
+    def extract_cards(self, image: ImageInput) -> List[str]:
         """Extract playing cards from image"""
         # Preprocess for card detection
-        processed = self.preprocess_image(image, ["grayscale", "threshold", "resize"])
+        if isinstance(image, PreprocessedRegion):
+            processed = self._upscaled(image)
+        else:
+            processed = self.preprocess_image(image, ["grayscale", "threshold", "resize"])
         
         # OCR with card-specific config
         result = self.extract_text(processed, preprocess=False,
-                                  custom_config="--psm 8 -c tessedit_char_whitelist=AKQJT23456789schd")
+                                  custom_config=_CARDS_CONFIG)
         
         if result.confidence < 0.5:
             return []
         
         # Find card patterns
-        cards = re.findall(r'[AKQJT2-9][schd]', result.text)
+        cards = _CARD_RE.findall(result.text)
         
         # Validate cards (should be 2-character strings)
         valid_cards = []
@@ -180,7 +755,7 @@ class OCREngine:
         
         return valid_cards
     
-    def extract_hud_stats(self, image: np.ndarray) -> Dict[str, float]:
+    def extract_hud_stats(self, image: ImageInput) -> Dict[str, float]:
         """Extract HUD statistics from image"""
         stats = {}
         
@@ -192,26 +767,16 @@ class OCREngine:
         
         text = result.text
         
-        # Extract common HUD stats
-        stat_patterns = {
-            "vpip": r"(?:VPIP|VP)[:\s]*([\d.]+)",
-            "pfr": r"(?:PFR|PR)[:\s]*([\d.]+)",
-            "3bet": r"(?:3B|3bet)[:\s]*([\d.]+)",
-            "fold_3bet": r"(?:F3B|Fold3B)[:\s]*([\d.]+)",
-            "cbet": r"(?:CB|Cbet)[:\s]*([\d.]+)",
-            "af": r"(?:AF|Agg)[:\s]*([\d.]+)",
-            "wtsd": r"(?:WTSD|WtSD)[:\s]*([\d.]+)",
-            "wwsf": r"(?:WWSF|W\$SF)[:\s]*([\d.]+)"
-        }
-        
-        for stat_name, pattern in stat_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    value = float(match.group(1))
-                    stats[stat_name] = value
-                except ValueError:
-                    pass
+        # Extract common HUD stats; the first reading of each stat wins
+        for match in _HUD_RE.finditer(text):
+            group = match.lastgroup
+            stat_name = _HUD_GROUP_STATS.get(group, group)
+            if stat_name in stats:
+                continue
+            try:
+                stats[stat_name] = float(match.group(group))
+            except ValueError:
+                pass
         
         return stats
     
@@ -235,8 +800,7 @@ class OCREngine:
                 processed = image
                 
             # Try different OCR modes
-            for psm in [8, 7, 11]:  # Single line, text line, sparse text
-                config = f"--psm {psm} -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+            for config in _USERNAME_CONFIGS:
                 result = self.extract_text(processed, preprocess=False, custom_config=config)
                 
                 if result and result.confidence > best_confidence:
@@ -258,44 +822,31 @@ class OCREngine:
         # Clean up common OCR errors in usernames
         text = result.text.strip()
         # Remove non-alphanumeric characters except underscore and dash
-        text = re.sub(r'[^A-Za-z0-9_\-]', '', text)
+        text = _USERNAME_STRIP_RE.sub('', text)
         
         # Validate username (must be reasonable)
         if len(text) >= 3 and len(text) <= 20:  # Reasonable username length
             # Check if it's likely a real username (not random OCR garbage)
             # Must have at least one letter or number
-            if re.search(r'[A-Za-z0-9]', text):
+            if _ALNUM_RE.search(text):
                 # Avoid common OCR misreads that look like system text
-                garbage_patterns = [
-                    r'^Error',
-                    r'^INFO',
-                    r'^DEBUG',
-                    r'window',
-                    r'poker',
-                    r'Found',
-                    r'updated',
-                    r'session',
-                    r'detected'
-                ]
-                
-                for pattern in garbage_patterns:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        logger.debug(f"Rejected garbage username: {text}")
-                        return None
+                if _GARBAGE_RE.search(text):
+                    logger.debug(f"Rejected garbage username: {text}")
+                    return None
                 
                 return text
         
         return None
     
-    def extract_pot_size(self, image: np.ndarray) -> Optional[float]:
+    def extract_pot_size(self, image: ImageInput) -> Optional[float]:
         """Extract pot size from image"""
         return self.extract_number(image, is_money=True)
     
-    def extract_stack_size(self, image: np.ndarray) -> Optional[float]:
+    def extract_stack_size(self, image: ImageInput) -> Optional[float]:
         """Extract player stack size from image"""
         return self.extract_number(image, is_money=True)
     
-    def extract_action_text(self, image: np.ndarray) -> Optional[str]:
+    def extract_action_text(self, image: ImageInput) -> Optional[str]:
         """Extract action text (fold, call, raise, etc.)"""
         result = self.extract_text(image, preprocess=True)
         
@@ -310,19 +861,26 @@ class OCREngine:
         for action in actions:
             if action in text:
                 # Try to extract amount if present
-                amount_match = re.search(r'[\d,]+\.?\d*', text)
+                amount_match = _AMOUNT_RE.search(text)
                 if amount_match and action in ["bet", "raise", "call"]:
                     return f"{action} {amount_match.group()}"
                 return action
         
         return None
     
-    def batch_extract(self, images: Dict[str, np.ndarray]) -> Dict[str, OCRResult]:
-        """Extract text from multiple images"""
+    def batch_extract(self, images: Dict[str, ImageInput]) -> Dict[str, OCRResult]:
+        """Extract text from multiple images in parallel"""
         results = {}
         
-        for name, image in images.items():
-            result = self.extract_text(image)
+        # Tesseract releases the GIL while recognizing (and tesserocr-mp threads just
+        # wait on worker processes), so threads scale here
+        names = list(images.keys())
+        if len(names) > 1 and self.max_workers > 1:
+            extracted = self._executor.map(self.extract_text, [images[n] for n in names])
+        else:
+            extracted = (self.extract_text(images[n]) for n in names)
+        
+        for name, result in zip(names, extracted):
             result.region = name
             results[name] = result
             
@@ -339,32 +897,65 @@ class OCREngine:
         
         return bool(re.match(pattern, text))
     
+    def tight_crop_text_bbox(self, image: np.ndarray, min_height: int = 8,
+                             min_area: int = 20, padding: int = 3) -> np.ndarray:
+        """Crop to the union bounding box of text-sized foreground components"""
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        
+        # Text is the minority class whether it's light-on-dark or dark-on-light
+        if cv2.countNonZero(binary) > binary.size // 2:
+            binary = cv2.bitwise_not(binary)
+        
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        
+        # Skip the background component (label 0)
+        stats = stats[1:]
+        stats = stats[(stats[:, cv2.CC_STAT_HEIGHT] > min_height) &
+                      (stats[:, cv2.CC_STAT_AREA] > min_area)]
+        if len(stats) == 0:
+            return image
+        
+        height, width = binary.shape
+        x1 = max(int(stats[:, cv2.CC_STAT_LEFT].min()) - padding, 0)
+        y1 = max(int(stats[:, cv2.CC_STAT_TOP].min()) - padding, 0)
+        x2 = min(int((stats[:, cv2.CC_STAT_LEFT] + stats[:, cv2.CC_STAT_WIDTH]).max()) + padding, width)
+        y2 = min(int((stats[:, cv2.CC_STAT_TOP] + stats[:, cv2.CC_STAT_HEIGHT]).max()) + padding, height)
+        
+        # Not worth it when the text already fills the region
+        if (x2 - x1) * (y2 - y1) >= 0.9 * width * height:
+            return image
+        
+        return image[y1:y2, x1:x2]
+    
     def improve_accuracy_for_region(self, image: np.ndarray, region_type: str) -> OCRResult:
         """Apply region-specific preprocessing for better accuracy"""
-        if region_type == "cards":
-            # High contrast for card detection
-            operations = ["grayscale", "threshold", "resize"]
-            config = "--psm 8 -c tessedit_char_whitelist=AKQJT23456789schd"
-        
-        elif region_type == "money":
-            # Optimize for numbers and currency
-            operations = ["grayscale", "adaptive_threshold", "denoise"]
-            config = "--psm 8 -c tessedit_char_whitelist=0123456789.$,"
-        
-        elif region_type == "hud":
-            # Balance for mixed text and numbers
-            operations = ["grayscale", "threshold", "denoise"]
-            config = "--psm 6"
-        
-        elif region_type == "username":
-            # Less aggressive preprocessing for text
-            operations = ["grayscale", "denoise"]
-            config = "--psm 8"
-        
-        else:
-            # Default settings
-            operations = self.preprocessing_pipeline
-            config = self.config
+        operations, config = _REGION_PROFILES.get(
+            region_type, (self.preprocessing_pipeline, self.config)
+        )
         
         processed = self.preprocess_image(image, operations)
-        return self.extract_text(processed, preprocess=False, custom_config=config)
\ No newline at end of file
+        
+        # Tesseract cost scales with pixel count - drop the avatar background
+        processed = self.tight_crop_text_bbox(processed)
+        
+        return self.extract_text(processed, preprocess=False, custom_config=config)
+    
+    def cleanup(self):
+        """Shut down OCR workers and release in-process tesseract handles"""
+        self._executor.shutdown(wait=True)
+        
+        for pool in self._api_pools.values():
+            while not pool.empty():
+                pool.get_nowait().End()
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+        with self._segment_lock:
+            for shm in self._segments:
+                shm.close()
+                shm.unlink()
+            self._segments.clear()
+            self._free_segments.clear()
+        
+        logger.info("OCREngine cleanup completed")
\ No newline at end of file
@@ -1,12 +1,50 @@
 import mss
+import cv2
 import numpy as np
-from PIL import Image
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Callable
 from dataclasses import dataclass
 from loguru import logger
+import threading
 import time
 
 
+# Fast libpng setting for debug/calibration dumps (default level is ~4-8x slower)
+PNG_FAST_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+# Generic 6-max seat centres as (x_ratio, y_ratio) of the table window
+_GENERIC_SEAT_NAMES = ("player_1", "player_2", "player_3", "player_4", "player_5", "player_6")
+_GENERIC_SEAT_CENTERS = np.array([
+    [0.5, 0.15],  # Top center
+    [0.8, 0.3],   # Top right
+    [0.8, 0.6],   # Bottom right
+    [0.5, 0.75],  # Bottom center (hero)
+    [0.2, 0.6],   # Bottom left
+    [0.2, 0.3],   # Top left
+])
+# Seat boxes as (x, y, width, height) ratios, one row per seat
+_GENERIC_SEAT_RATIOS = np.column_stack([
+    _GENERIC_SEAT_CENTERS - (0.08, 0.05),
+    np.broadcast_to((0.16, 0.1), _GENERIC_SEAT_CENTERS.shape)
+])
+
+
+def scale_ratio_rects(ratios: np.ndarray, x: int, y: int, width: int, height: int) -> np.ndarray:
+    """
+    Convert rows of (x, y, width, height) window ratios to absolute pixel rects
+    
+    Args:
+        ratios: (N, 4) array of ratios of the window size
+        x, y, width, height: Window bounds
+        
+    Returns:
+        (N, 4) int array of (x, y, width, height) screen rects
+    """
+    # Truncate like int() before offsetting so results match per-seat scalar math
+    rects = (np.asarray(ratios, dtype=np.float64) * (width, height, width, height)).astype(np.int64)
+    rects[:, :2] += (x, y)
+    return rects
+
+
 @dataclass
 class CaptureRegion:
     """Defines a screen region to capture"""
@@ -26,16 +64,120 @@ class CaptureRegion:
         }
 
 
+class WindowTracker:
+    """
+    Polls a window's bounds on a background thread so the capture loop never
+    makes the window-manager query itself
+    
+    `poll` returns the current (x, y, width, height) or None when the window is
+    gone. Readers get the last polled value from `bounds`, and `version`
+    increments whenever it changes. `invalidate()` forces a poll before the
+    interval is up, so with OS move/resize events the interval is only a
+    safety net.
+    """
+    
+    def __init__(self, poll: Callable[[], Optional[Tuple[int, int, int, int]]],
+                 interval: float = 0.5):
+        self.poll = poll
+        self.interval = interval
+        self._bounds = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """Last polled window bounds"""
+        with self._lock:
+            return self._bounds
+    
+    @property
+    def version(self) -> int:
+        """Number of times the bounds have changed"""
+        with self._lock:
+            return self._version
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the polling thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def refresh(self) -> Optional[Tuple[int, int, int, int]]:
+        """Poll once now and publish the result"""
+        try:
+            bounds = self.poll()
+        except Exception as e:
+            logger.error(f"Window bounds poll failed: {e}")
+            bounds = None
+        
+        if bounds is not None:
+            bounds = tuple(bounds)
+        with self._lock:
+            if bounds != self._bounds:
+                self._bounds = bounds
+                self._version += 1
+        return bounds
+    
+    def invalidate(self):
+        """Poll as soon as possible instead of waiting out the interval"""
+        self._wake_event.set()
+    
+    def start(self):
+        """Poll once synchronously, then keep polling in the background"""
+        if self.is_running:
+            return
+        self.refresh()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="window-tracker", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+    
+    def _run(self):
+        while True:
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            self.refresh()
+
+
 class ScreenCapture:
     """Handles screen capture operations for poker tables"""
     
     def __init__(self):
-        self.sct = mss.mss()
+        # mss handles are bound to the thread that created them
+        self._local = threading.local()
+        self._sct_instances = []
+        self._sct_lock = threading.Lock()
         self.monitors = self.sct.monitors
         self.regions = {}
         self.last_capture_time = {}
+        # (site, table bounds) the current site regions were laid out for
+        self._site_layout = None
         logger.info(f"ScreenCapture initialized with {len(self.monitors) - 1} monitors")
     
+    @property
+    def sct(self):
+        """mss instance for the calling thread, created on first use"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            # Only used by mss.tools PNG output; keep it on the cheapest setting
+            sct.compression_level = 0
+            self._local.sct = sct
+            with self._sct_lock:
+                self._sct_instances.append(sct)
+        return sct
+    
     def get_monitors_info(self) -> List[Dict[str, Any]]:
         """Get information about all available monitors"""
         info = []
@@ -49,12 +191,44 @@ class ScreenCapture:
             })
         return info
     
-    def capture_region(self, region: CaptureRegion) -> np.ndarray:
-        """Capture a specific screen region"""
+    @staticmethod
+    def _to_rgb(screenshot, out: Optional[np.ndarray] = None, bgr: bool = False) -> np.ndarray:
+        """
+        Convert an mss BGRA screenshot to an RGB (or BGR) array in a single pass
+        
+        Writes into `out` when it has the screenshot's shape; otherwise (and by
+        default) returns a fresh array, since most callers keep frames around.
+        BGR is OpenCV's own order, for captures that only go to cv2.imwrite.
+        """
+        # View the raw buffer directly instead of round-tripping through PIL
+        bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+        code = cv2.COLOR_BGRA2BGR if bgr else cv2.COLOR_BGRA2RGB
+        if out is not None and out.shape == (screenshot.height, screenshot.width, 3):
+            return cv2.cvtColor(bgra, code, dst=out)
+        return cv2.cvtColor(bgra, code)
+    
+    def capture_region(self, region: CaptureRegion, bgr: bool = False) -> np.ndarray:
+        """Capture a specific screen region (RGB unless `bgr` is set)"""
+        try:
+            screenshot = self.sct.grab(region.to_dict())
+            return self._to_rgb(screenshot, bgr=bgr)
+        except Exception as e:
+            logger.error(f"Failed to capture region {region.name}: {e}")
+            return None
+    
+    def capture_region_into(self, region: CaptureRegion, out: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Capture a region into a caller-owned (height, width, 3) RGB buffer
+        
+        For capture loops that grab the same rect every tick. The result is
+        `out` itself unless the grab came back a different size (e.g. display
+        scaling), in which case a new array is returned.
+        """
         try:
             screenshot = self.sct.grab(region.to_dict())
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            return np.array(img)
+            return self._to_rgb(screenshot, out)
         except Exception as e:
             logger.error(f"Failed to capture region {region.name}: {e}")
             return None
@@ -67,8 +241,7 @@ class ScreenCapture:
                 return None
             
             screenshot = self.sct.grab(self.monitors[monitor_index])
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            return np.array(img)
+            return self._to_rgb(screenshot)
         except Exception as e:
             logger.error(f"Failed to capture monitor {monitor_index}: {e}")
             return None
@@ -91,16 +264,53 @@ class ScreenCapture:
         if region_names is None:
             region_names = list(self.regions.keys())
         
-        captures = {}
-        for name in region_names:
-            if name in self.regions:
-                img = self.capture_named_region(name)
-                if img is not None:
-                    captures[name] = img
-                    self.last_capture_time[name] = time.time()
+        sub_regions = {name: self.regions[name] for name in region_names if name in self.regions}
+        if not sub_regions:
+            return {}
+        
+        # One grab of the regions' bounding box instead of one grab per region
+        captures = self.capture_window_then_slice(self._bounding_box(sub_regions.values()), sub_regions)
+        
+        now = time.time()
+        for name in captures:
+            self.last_capture_time[name] = now
         
         return captures
     
+    @staticmethod
+    def _bounding_box(regions) -> Tuple[int, int, int, int]:
+        """Smallest (x, y, width, height) box containing all regions"""
+        regions = list(regions)
+        left = min(r.x for r in regions)
+        top = min(r.y for r in regions)
+        right = max(r.x + r.width for r in regions)
+        bottom = max(r.y + r.height for r in regions)
+        return left, top, right - left, bottom - top
+    
+    def capture_window_then_slice(self, window_bounds: Tuple[int, int, int, int],
+                                  sub_regions: Dict[str, CaptureRegion],
+                                  bgr: bool = False) -> Dict[str, np.ndarray]:
+        """Grab a window once and cut named sub-regions out of it as zero-copy views"""
+        x, y, width, height = window_bounds
+        frame = self.capture_region(CaptureRegion(x, y, width, height, "window"), bgr=bgr)
+        if frame is None:
+            return {}
+        
+        crops = {}
+        for name, region in sub_regions.items():
+            # Offsets relative to the window, clipped to the grabbed frame
+            x1 = max(region.x - x, 0)
+            y1 = max(region.y - y, 0)
+            x2 = min(region.x - x + region.width, width)
+            y2 = min(region.y - y + region.height, height)
+            
+            if x2 > x1 and y2 > y1:
+                crops[name] = frame[y1:y2, x1:x2]
+            else:
+                logger.debug(f"Region '{name}' lies outside window bounds {window_bounds}")
+        
+        return crops
+    
     def find_window_region(self, window_title: str) -> Optional[CaptureRegion]:
         """Find the region of a window by its title (platform-specific)"""
         # This would need platform-specific implementation
@@ -108,11 +318,13 @@ class ScreenCapture:
         logger.warning("Window detection not yet implemented")
         return None
     
-    def save_capture(self, image: np.ndarray, filepath: str):
-        """Save captured image to file"""
+    def save_capture(self, image: np.ndarray, filepath: str, bgr: bool = False):
+        """Save captured image to file; pass `bgr` for captures taken with bgr=True"""
         try:
-            img = Image.fromarray(image)
-            img.save(filepath)
+            if not bgr:
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            if not cv2.imwrite(filepath, image, PNG_FAST_PARAMS):
+                raise IOError(f"cv2.imwrite could not write {filepath}")
             logger.debug(f"Saved capture to {filepath}")
         except Exception as e:
             logger.error(f"Failed to save capture: {e}")
@@ -128,17 +340,18 @@ class ScreenCapture:
             "chat"
         ]
         
-        captures = {}
-        for region_name in table_regions:
-            if region_name in self.regions:
-                img = self.capture_named_region(region_name)
-                if img is not None:
-                    captures[region_name] = img
+        sub_regions = {name: self.regions[name] for name in table_regions if name in self.regions}
+        if not sub_regions:
+            return {}
         
-        return captures
+        return self.capture_window_then_slice(self._bounding_box(sub_regions.values()), sub_regions)
     
     def setup_poker_site_regions(self, site: str, table_bounds: Tuple[int, int, int, int]):
         """Setup standard regions for a poker site"""
+        layout = (site.lower(), tuple(table_bounds))
+        if layout == self._site_layout:
+            return  # Window hasn't moved; regions are still valid
+        self._site_layout = layout
         x, y, width, height = table_bounds
         
         if site.lower() == "pokerstars":
@@ -183,22 +396,10 @@ class ScreenCapture:
             int(width * 0.3), int(height * 0.06), "pot"
         ))
         
-        # Player positions (6-max example)
-        positions = [
-            ("player_1", 0.5, 0.15),  # Top center
-            ("player_2", 0.8, 0.3),   # Top right
-            ("player_3", 0.8, 0.6),   # Bottom right
-            ("player_4", 0.5, 0.75),  # Bottom center (hero)
-            ("player_5", 0.2, 0.6),   # Bottom left
-            ("player_6", 0.2, 0.3),   # Top left
-        ]
-        
-        for name, x_ratio, y_ratio in positions:
-            self.add_region(name, CaptureRegion(
-                x + int(width * (x_ratio - 0.08)),
-                y + int(height * (y_ratio - 0.05)),
-                int(width * 0.16), int(height * 0.1), name
-            ))
+        # Player positions (6-max example), scaled for all seats at once
+        rects = scale_ratio_rects(_GENERIC_SEAT_RATIOS, x, y, width, height)
+        for name, (seat_x, seat_y, seat_w, seat_h) in zip(_GENERIC_SEAT_NAMES, rects.tolist()):
+            self.add_region(name, CaptureRegion(seat_x, seat_y, seat_w, seat_h, name))
     
     def get_capture_rate(self, region_name: str) -> float:
         """Get the capture rate for a specific region"""
@@ -214,6 +415,12 @@ class ScreenCapture:
     
     def cleanup(self):
         """Clean up resources"""
-        if hasattr(self, 'sct'):
-            self.sct.close()
-            logger.info("ScreenCapture cleanup completed")
\ No newline at end of file
+        with self._sct_lock:
+            instances, self._sct_instances = self._sct_instances, []
+        for sct in instances:
+            try:
+                sct.close()
+            except Exception as e:
+                logger.debug(f"Failed to close mss instance: {e}")
+        self._local = threading.local()
+        logger.info("ScreenCapture cleanup completed")
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Background read pipeline: table capture, detection and analysis overlapped on
+separate threads
+"""
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from capture.table_reader import TableFrame, TableReader, TableState
+
+
+def pin_current_thread(cores: Iterable[int]) -> bool:
+    """
+    Restrict the calling thread to the given logical CPUs
+    
+    Keeps a busy stage on warm caches instead of being migrated between
+    cores. Linux and Windows only; returns False where unsupported.
+    """
+    cores = sorted(set(cores))
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            # On Linux, pid 0 means the calling thread rather than the process
+            os.sched_setaffinity(0, cores)
+            return True
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentThread.restype = ctypes.c_void_p
+            kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            mask = sum(1 << core for core in cores)
+            return bool(kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), mask))
+    except Exception as e:
+        logger.warning(f"Could not pin thread to CPUs {cores}: {e}")
+    return False
+
+
+class TablePipeline:
+    """
+    Runs a TableReader's capture, detection and analysis stages on their own
+    threads, so the next frame is grabbed and run through YOLO while the
+    current one is still being OCRed
+    
+    Stages hand frames on through small bounded queues. When a stage falls
+    behind, the oldest waiting frame is dropped rather than the producer
+    blocking, so results stay current. latest_state() never blocks.
+    """
+    
+    def __init__(self, reader: TableReader, interval: float = 1.0, queue_size: int = 2,
+                 cpu_affinity: Optional[Dict[str, Iterable[int]]] = None):
+        """
+        Args:
+            reader: Reader whose capture_frame/detect_frame/analyze_frame run as stages
+            interval: Seconds between captures
+            queue_size: Frames allowed to wait in front of each stage
+            cpu_affinity: Stage name ("capture", "detect", "analyze") -> logical
+                CPUs its thread is pinned to; unlisted stages are left to the OS
+        """
+        self.reader = reader
+        self.interval = interval
+        self.cpu_affinity = dict(cpu_affinity or {})
+        self._detect_queue = queue.Queue(maxsize=queue_size)
+        self._analyze_queue = queue.Queue(maxsize=queue_size)
+        self._states = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the stage threads are alive"""
+        return any(thread.is_alive() for thread in self._threads)
+    
+    def start(self):
+        """Start the capture, detection and analysis threads"""
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(name, target),
+                             name=f"table-{name}", daemon=True)
+            for name, target in (("capture", self._capture_loop),
+                                 ("detect", self._detect_loop),
+                                 ("analyze", self._analyze_loop))
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Table read pipeline started ({self.interval}s interval)")
+    
+    def stop(self):
+        """Stop all stages and recycle any frames still queued"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=max(self.interval, 1.0) * 2)
+        self._threads = []
+        
+        for pending in (self._detect_queue, self._analyze_queue):
+            while True:
+                try:
+                    self.reader.release_frame(pending.get_nowait())
+                except queue.Empty:
+                    break
+    
+    def latest_state(self) -> Optional[TableState]:
+        """Newest state produced since the last call, or None"""
+        try:
+            return self._states.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def _run_stage(self, name: str, loop):
+        cores = self.cpu_affinity.get(name)
+        if cores and pin_current_thread(cores):
+            logger.debug(f"Table {name} stage pinned to CPUs {sorted(set(cores))}")
+        loop()
+    
+    def _capture_loop(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                frame = self.reader.capture_frame()
+            except Exception as e:
+                logger.error(f"Table capture failed: {e}")
+                frame = None
+            
+            if frame is not None:
+                self._offer(self._detect_queue, frame)
+            self._stop_event.wait(max(self.interval - (time.monotonic() - started), 0.0))
+    
+    def _detect_loop(self):
+        while True:
+            frame = self._take(self._detect_queue)
+            if frame is None:
+                return
+            try:
+                self.reader.detect_frame(frame)
+            except Exception as e:
+                logger.error(f"Table detection failed: {e}")
+                self.reader.release_frame(frame)
+                continue
+            self._offer(self._analyze_queue, frame)
+    
+    def _analyze_loop(self):
+        while True:
+            frame = self._take(self._analyze_queue)
+            if frame is None:
+                return
+            try:
+                state = self.reader.analyze_frame(frame)
+            except Exception as e:
+                logger.error(f"Failed to read table state: {e}")
+                continue
+            if state is not None:
+                self._offer(self._states, state)
+    
+    def _take(self, source: queue.Queue):
+        """Next item from a stage queue, or None once the pipeline is stopping"""
+        while not self._stop_event.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+    
+    def _offer(self, target: queue.Queue, item):
+        """Queue an item without blocking, dropping the oldest waiting one if full"""
+        while True:
+            try:
+                target.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = target.get_nowait()
+                except queue.Empty:
+                    continue
+                # Frames dropped before analysis never had crops taken from them
+                if isinstance(dropped, TableFrame):
+                    self.reader.release_frame(dropped)
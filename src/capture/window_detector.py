@@ -3,14 +3,48 @@ Window detector for finding and tracking poker table windows
 """
 import sys
 import re
-from typing import Optional, Tuple, List, Dict
+import threading
+import time
+from operator import attrgetter
+from typing import Callable, Optional, Tuple, List, Dict
 from loguru import logger
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 # Platform-specific imports
 if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
     import win32gui
     import win32con
     import win32api
+    
+    # WinEvent hooks for move/resize/close notifications (not wrapped by pywin32)
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+    OBJID_WINDOW = 0
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    
+    _WINEVENTPROC = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _WINEVENTPROC,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    )
+    _user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    _user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    _user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+    _user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+    _user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    _kernel32 = ctypes.WinDLL("kernel32")
 elif sys.platform == "darwin":
     # macOS implementation would use Quartz
     pass
@@ -18,9 +52,25 @@ else:
     # Linux implementation would use X11
     pass
 
+# Implicit lookups (get_window_bounds with no window) enumerate at most this often
+_ENUM_RETRY_INTERVAL = 1.0
+# A move is reported again only after the rect has been quiet this long
+_MOVE_SETTLE_INTERVAL = 0.1
+# Shell and input-method windows that can never be a poker client
+_IGNORED_WINDOW_CLASSES = frozenset({
+    "Shell_TrayWnd", "Shell_SecondaryTrayWnd", "Progman", "WorkerW",
+    "IME", "MSCTFIME UI", "tooltips_class32", "NotifyIconOverflowWindow",
+})
+
+
+class _StopEnum(Exception):
+    """Raised from an EnumWindows callback to end the enumeration early"""
+
 
 class WindowInfo:
     """Information about a window"""
+    __slots__ = ('handle', 'title', 'x', 'y', 'width', 'height', 'area')
+    
     def __init__(self, handle: int, title: str, x: int, y: int, width: int, height: int):
         self.handle = handle
         self.title = title
@@ -28,6 +78,8 @@ class WindowInfo:
         self.y = y
         self.width = width
         self.height = height
+        # Candidates are ranked by size; keep in step with width/height
+        self.area = width * height
     
     def __repr__(self):
         return f"WindowInfo(title='{self.title}', pos=({self.x},{self.y}), size=({self.width}x{self.height}))"
@@ -39,7 +91,40 @@ class WindowDetector:
     def __init__(self, site: str = "betonline"):
         self.site = site.lower()
         self.current_window = None
+        # Whether current_window is a table rather than a lobby/fallback
+        # match; a live table window is kept without re-enumerating
+        self._current_is_table = False
+        self._last_enum_time = None
+        # Rect changes smaller than this (summed over x/y/w/h) are jitter;
+        # a drag reports one update per burst rather than one per event
+        self._min_delta_px = 4
+        self._pending_update_ts = None
         self.window_patterns = self._get_window_patterns()
+        # All title patterns as one alternation, so each window costs one search
+        self._title_re = re.compile("|".join(f"(?:{p})" for p in self.window_patterns), re.IGNORECASE)
+        self._title_matches = self._compile_title_matcher()
+        self.window_classes = self._get_window_classes()
+        # Take the first table window found instead of the largest of all of them
+        self.single_table = True
+        
+        # The platform never changes, so pick each implementation once
+        if sys.platform == "win32":
+            self._find_impl = self._find_poker_window_windows
+            self._update_impl = self._update_window_position_windows
+            self._active_impl = self._is_window_active_windows
+            self._front_impl = self._bring_to_front_windows
+        else:
+            self._find_impl = (self._find_window_macos if sys.platform == "darwin"
+                               else self._find_window_linux)
+            self._update_impl = lambda: False
+            self._active_impl = lambda: True
+            self._front_impl = lambda: None
+        
+        # Move/resize/close notifications for the current window
+        self._change_callback = None
+        self._watched_handle = None
+        self._event_thread = None
+        self._event_thread_id = None
         
         logger.info(f"WindowDetector initialized for {site}")
     
@@ -66,16 +151,87 @@ class WindowDetector:
                 r"GGPoker"
             ]
         }
-        return patterns.get(self.site, [self.site])
+        # Unknown sites match their name literally
+        return patterns.get(self.site, [re.escape(self.site)])
+    
+    def _compile_title_matcher(self) -> Callable[[str], bool]:
+        """
+        Build the title test used during enumeration
+        
+        With hyperscan installed, every pattern it supports goes into one
+        automaton; the few it rejects (lookarounds) stay in a Python regex
+        that is only tried when the automaton finds nothing.
+        """
+        if hyperscan is None:
+            return lambda title: self._title_re.search(title) is not None
+        
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        supported, leftover = [], []
+        for pattern in self.window_patterns:
+            try:
+                hyperscan.Database().compile(expressions=[pattern.encode()], ids=[0], flags=[flags])
+                supported.append(pattern)
+            except hyperscan.error:
+                leftover.append(pattern)
+        
+        if not supported:
+            return lambda title: self._title_re.search(title) is not None
+        
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[p.encode() for p in supported],
+            ids=list(range(len(supported))),
+            flags=[flags] * len(supported)
+        )
+        leftover_re = (re.compile("|".join(f"(?:{p})" for p in leftover), re.IGNORECASE)
+                       if leftover else None)
+        
+        def stop_scan(pattern_id, start, end, scan_flags, context):
+            return True
+        
+        def matches(title: str) -> bool:
+            try:
+                database.scan(title.encode("utf-8", "replace"), match_event_handler=stop_scan)
+            except hyperscan.ScanTerminated:
+                return True
+            return leftover_re is not None and leftover_re.search(title) is not None
+        
+        logger.debug(f"Hyperscan title matcher: {len(supported)} patterns, {len(leftover)} via re")
+        return matches
+    
+    def _get_window_classes(self) -> List[str]:
+        """
+        Get the top-level window class names used by each site's client
+        
+        Sites listed here are looked up with FindWindowEx, so only their own
+        windows are inspected; the rest enumerate every top-level window.
+        """
+        classes = {
+            "pokerstars": ["PokerStarsTableFrameClass"],
+        }
+        return classes.get(self.site, [])
     
     def find_poker_window(self) -> Optional[WindowInfo]:
-        """Find the poker table window"""
-        if sys.platform == "win32":
-            return self._find_window_windows()
-        elif sys.platform == "darwin":
-            return self._find_window_macos()
-        else:
-            return self._find_window_linux()
+        """
+        Find the poker table window
+        
+        A table window that is still open is returned as is (with its rect
+        refreshed) rather than enumerating every top-level window again. A
+        lobby or other fallback match is re-checked, so an opened table wins.
+        """
+        return self._find_impl()
+    
+    def _find_poker_window_windows(self) -> Optional[WindowInfo]:
+        """find_poker_window on Windows, keeping the event hook on the result"""
+        window = None
+        if self._current_is_table and self.is_window_active():
+            self.update_window_position()
+            window = self.current_window
+        if window is None:
+            window = self._find_window_windows()
+        if window and self._change_callback and window.handle != self._watched_handle:
+            self._arm_window_events()
+        return window
     
     def _find_window_windows(self) -> Optional[WindowInfo]:
         """Find window on Windows"""
@@ -83,47 +239,70 @@ class WindowDetector:
             found_windows = []
             priority_windows = []  # Windows that match table patterns
             
+            def consider(hwnd, windows):
+                if not win32gui.IsWindowVisible(hwnd):
+                    return
+                
+                # Size and class are cheap in-process lookups; the title is a
+                # cross-process WM_GETTEXT, so it is fetched last
+                x, y, right, bottom = win32gui.GetWindowRect(hwnd)
+                width = right - x
+                height = bottom - y
+                # Only consider reasonably sized windows
+                if width <= 400 or height <= 300:
+                    return
+                if win32gui.GetClassName(hwnd) in _IGNORED_WINDOW_CLASSES:
+                    return
+                
+                window_title = win32gui.GetWindowText(hwnd)
+                # Check if title matches any of our patterns
+                if window_title and self._title_matches(window_title):
+                    window_info = WindowInfo(
+                        hwnd, window_title, x, y, width, height
+                    )
+                    
+                    # Prioritize table windows over lobby
+                    if "Lobby" in window_title:
+                        windows.append(window_info)
+                    elif any(table_word in window_title for table_word in ["Table", "Holdem", "Hold'em", "Omaha"]):
+                        priority_windows.append(window_info)
+                    else:
+                        windows.append(window_info)
+            
             def enum_callback(hwnd, windows):
-                if win32gui.IsWindowVisible(hwnd):
-                    window_title = win32gui.GetWindowText(hwnd)
-                    if window_title:
-                        # Check if title matches any of our patterns
-                        for i, pattern in enumerate(self.window_patterns):
-                            if re.search(pattern, window_title, re.IGNORECASE):
-                                rect = win32gui.GetWindowRect(hwnd)
-                                x, y, right, bottom = rect
-                                width = right - x
-                                height = bottom - y
-                                
-                                # Only consider reasonably sized windows
-                                if width > 400 and height > 300:
-                                    window_info = WindowInfo(
-                                        hwnd, window_title, x, y, width, height
-                                    )
-                                    
-                                    # Prioritize table windows over lobby
-                                    if "Lobby" in window_title:
-                                        windows.append(window_info)
-                                    elif any(table_word in window_title for table_word in ["Table", "Holdem", "Hold'em", "Omaha"]):
-                                        priority_windows.append(window_info)
-                                    else:
-                                        windows.append(window_info)
-                                    break
+                consider(hwnd, windows)
+                # Lobby matches keep the scan going; a table may come later
+                if self.single_table and priority_windows:
+                    raise _StopEnum()
                 return True
             
-            win32gui.EnumWindows(enum_callback, found_windows)
+            self._last_enum_time = time.monotonic()
+            # Let the window manager filter by class when the client's is known
+            for class_name in self.window_classes:
+                hwnd = win32gui.FindWindowEx(0, 0, class_name, None)
+                while hwnd and not (self.single_table and priority_windows):
+                    consider(hwnd, found_windows)
+                    hwnd = win32gui.FindWindowEx(0, hwnd, class_name, None)
+            
+            if not (priority_windows or found_windows):
+                try:
+                    win32gui.EnumWindows(enum_callback, found_windows)
+                except _StopEnum:
+                    pass
             
             # Prefer table windows over lobby windows
             if priority_windows:
                 # Return the largest table window
-                largest = max(priority_windows, key=lambda w: w.width * w.height)
+                largest = max(priority_windows, key=attrgetter('area'))
                 self.current_window = largest
+                self._current_is_table = True
                 logger.info(f"Found poker table window: {largest}")
                 return largest
             elif found_windows:
                 # Fall back to other windows if no table found
-                largest = max(found_windows, key=lambda w: w.width * w.height)
+                largest = max(found_windows, key=attrgetter('area'))
                 self.current_window = largest
+                self._current_is_table = False
                 logger.info(f"Found poker window (may be lobby): {largest}")
                 return largest
             else:
@@ -146,7 +325,8 @@ class WindowDetector:
     
     def get_window_bounds(self) -> Optional[Tuple[int, int, int, int]]:
         """Get current window bounds (x, y, width, height)"""
-        if not self.current_window:
+        if not self.current_window and (self._last_enum_time is None or
+                                        time.monotonic() - self._last_enum_time >= _ENUM_RETRY_INTERVAL):
             self.find_poker_window()
         
         if self.current_window:
@@ -158,30 +338,43 @@ class WindowDetector:
         """Update the current window position if it has moved"""
         if not self.current_window:
             return False
-        
-        if sys.platform == "win32":
-            try:
-                rect = win32gui.GetWindowRect(self.current_window.handle)
-                x, y, right, bottom = rect
-                width = right - x
-                height = bottom - y
+        return self._update_impl()
+    
+    def _update_window_position_windows(self) -> bool:
+        """update_window_position on Windows"""
+        try:
+            rect = win32gui.GetWindowRect(self.current_window.handle)
+            x, y, right, bottom = rect
+            width = right - x
+            height = bottom - y
+            
+            window = self.current_window
+            delta = (abs(x - window.x) + abs(y - window.y) +
+                     abs(width - window.width) + abs(height - window.height))
+            if delta < self._min_delta_px:
+                return False
+            
+            window.x = x
+            window.y = y
+            window.width = width
+            window.height = height
+            window.area = width * height
+            
+            # Bounds always follow the window, but only the first change
+            # after a quiet spell counts as a new update
+            now = time.monotonic()
+            last, self._pending_update_ts = self._pending_update_ts, now
+            if last is None or now - last >= _MOVE_SETTLE_INTERVAL:
+                logger.debug(f"Window updated: pos=({x},{y}), size=({width}x{height})")
+                return True
                 
-                # Check if window has moved or resized
-                if (self.current_window.x != x or self.current_window.y != y or
-                    self.current_window.width != width or self.current_window.height != height):
-                    
-                    self.current_window.x = x
-                    self.current_window.y = y
-                    self.current_window.width = width
-                    self.current_window.height = height
-                    
-                    logger.debug(f"Window updated: pos=({x},{y}), size=({width}x{height})")
-                    return True
-                    
-            except Exception as e:
-                logger.error(f"Error updating window position: {e}")
-                # Window might be closed, try to find it again
+        except Exception as e:
+            logger.error(f"Error updating window position: {e}")
+            # Only a closed window is worth searching for again; a
+            # transient failure keeps the last known rect
+            if not self.is_window_active():
                 self.current_window = None
+                self._current_is_table = False
                 self.find_poker_window()
         
         return False
@@ -190,22 +383,106 @@ class WindowDetector:
         """Check if the poker window is still active"""
         if not self.current_window:
             return False
-        
-        if sys.platform == "win32":
-            try:
-                return win32gui.IsWindow(self.current_window.handle)
-            except:
-                return False
-        
-        return True
+        return self._active_impl()
+    
+    def _is_window_active_windows(self) -> bool:
+        """is_window_active on Windows"""
+        try:
+            return win32gui.IsWindow(self.current_window.handle)
+        except:
+            return False
     
     def bring_to_front(self):
         """Bring the poker window to front"""
         if not self.current_window:
             return
+        self._front_impl()
+    
+    def _bring_to_front_windows(self):
+        """bring_to_front on Windows"""
+        try:
+            win32gui.SetForegroundWindow(self.current_window.handle)
+        except Exception as e:
+            logger.error(f"Error bringing window to front: {e}")
+    
+    def watch_window_changes(self, callback: Callable[[], None]) -> bool:
+        """
+        Call `callback` whenever the poker window moves, resizes or closes
+        
+        The hook follows the window across find_poker_window() calls. Callbacks
+        arrive on a background thread and should only flag work for later.
+        
+        Returns:
+            False when this platform has no window events wired up, in which
+            case callers should keep polling
+        """
+        if sys.platform != "win32":
+            return False
+        
+        self._change_callback = callback
+        if self.current_window:
+            self._arm_window_events()
+        return True
+    
+    def stop_watching(self):
+        """Remove the window event hook installed by watch_window_changes()"""
+        self._change_callback = None
+        self._disarm_window_events()
+    
+    def _arm_window_events(self):
+        """Install the WinEvent hook for the current window on its own thread"""
+        self._disarm_window_events()
+        
+        hwnd = self.current_window.handle
+        ready = threading.Event()
+        self._event_thread = threading.Thread(
+            target=self._window_event_loop, args=(hwnd, ready),
+            name="window-events", daemon=True
+        )
+        self._event_thread.start()
+        ready.wait(timeout=1.0)
+        self._watched_handle = hwnd
+    
+    def _disarm_window_events(self):
+        """Stop the hook thread's message loop, which unhooks on the way out"""
+        if self._event_thread is None:
+            return
+        if self._event_thread_id is not None:
+            _user32.PostThreadMessageW(self._event_thread_id, win32con.WM_QUIT, 0, 0)
+        self._event_thread.join(timeout=1.0)
+        self._event_thread = None
+        self._event_thread_id = None
+        self._watched_handle = None
+    
+    def _window_event_loop(self, hwnd: int, ready: threading.Event):
+        """Hook thread: out-of-context WinEvents are delivered through its message loop"""
+        def on_event(hook, event, event_hwnd, id_object, id_child, thread_id, event_time):
+            if event_hwnd == hwnd and id_object == OBJID_WINDOW and self._change_callback:
+                self._change_callback()
         
-        if sys.platform == "win32":
-            try:
-                win32gui.SetForegroundWindow(self.current_window.handle)
-            except Exception as e:
-                logger.error(f"Error bringing window to front: {e}")
\ No newline at end of file
+        # Keep the ctypes thunk referenced for as long as the hooks exist
+        proc = _WINEVENTPROC(on_event)
+        
+        # Only listen to the thread that owns the table window, not the desktop
+        process_id = wintypes.DWORD()
+        thread_id = _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
+        hooks = [
+            _user32.SetWinEventHook(event, event, None, proc, process_id.value, thread_id,
+                                    WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+            for event in (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_DESTROY)
+        ]
+        if not all(hooks):
+            logger.warning("Could not hook window events; relying on polling")
+        
+        self._event_thread_id = _kernel32.GetCurrentThreadId()
+        ready.set()
+        
+        try:
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    _user32.UnhookWinEvent(hook)
@@ -1,9 +1,33 @@
 import os
+import copy
+import atexit
+import threading
+import weakref
 import yaml
 from typing import Dict, Any, Optional
 from pathlib import Path
 from loguru import logger
 
+# libyaml's parser/emitter when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+_MISSING = object()
+
+# set() calls within this many seconds of each other share one file write
+_SAVE_DELAY = 0.5
+
+# Live Settings, flushed once at exit without being kept alive until then
+_instances = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for settings in list(_instances):
+        settings.flush()
+
 
 class Settings:
     """Configuration management for Poker Assistant"""
@@ -28,7 +52,8 @@ class Settings:
             'update_interval': 1.0,
             'monitor_index': 1,
             'save_screenshots': False,
-            'screenshot_dir': 'data/screenshots'
+            'screenshot_dir': 'data/screenshots',
+            'debug_screenshots': False
         },
         
         'hand_history': {
@@ -80,7 +105,15 @@ class Settings:
     
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or self._get_default_config_path()
+        self._save_timer: Optional[threading.Timer] = None
+        # Covers the pending timer and changes to self.config, so the timer
+        # thread never dumps a config that set() or reload() is midway through
+        self._save_lock = threading.RLock()
+        # Held across snapshot and write, so writes land in snapshot order
+        self._write_lock = threading.Lock()
+        _instances.add(self)
         self.config = self._load_config()
+        self._flat_cache = self._flatten(self.config)
         logger.info(f"Settings loaded from {self.config_path}")
     
     def _get_default_config_path(self) -> str:
@@ -105,7 +138,7 @@ class Settings:
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r') as f:
-                    user_config = yaml.safe_load(f) or {}
+                    user_config = yaml.load(f, Loader=YamlLoader) or {}
                 
                 # Merge with defaults
                 config = self._deep_merge(self.DEFAULT_CONFIG.copy(), user_config)
@@ -121,11 +154,15 @@ class Settings:
     
     def _deep_merge(self, base: dict, update: dict) -> dict:
         """Deep merge two dictionaries"""
-        for key, value in update.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                base[key] = self._deep_merge(base[key], value)
-            else:
-                base[key] = value
+        # Explicit stack of (target, overrides) pairs instead of recursion
+        stack = [(base, update)]
+        while stack:
+            target, overrides = stack.pop()
+            for key, value in overrides.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         return base
     
     def _save_config(self, config: dict):
@@ -133,13 +170,29 @@ class Settings:
         try:
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             with open(self.config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
             logger.info(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
     
+    @staticmethod
+    def _flatten(config: dict, prefix: str = '') -> Dict[str, Any]:
+        """Map every dot-notation key (sections included) to its value"""
+        flat = {}
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(Settings._flatten(value, f"{path}."))
+        return flat
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key (supports dot notation)"""
+        value = self._flat_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        # Keys added to self.config directly aren't in the flat map yet
         keys = key.split('.')
         value = self.config
         
@@ -154,19 +207,46 @@ class Settings:
     def set(self, key: str, value: Any):
         """Set configuration value by key (supports dot notation)"""
         keys = key.split('.')
-        config = self.config
-        
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        
-        config[keys[-1]] = value
-        self._save_config(self.config)
+        with self._save_lock:
+            config = self.config
+            
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
+            
+            config[keys[-1]] = value
+            self._flat_cache = self._flatten(self.config)
+            self._schedule_save()
+    
+    def _schedule_save(self):
+        """Write the config once set() calls stop arriving"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(_SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Write any pending set() changes to disk now"""
+        with self._write_lock:
+            with self._save_lock:
+                if self._save_timer is None:
+                    return
+                self._save_timer.cancel()
+                self._save_timer = None
+                # Written from a snapshot so set() isn't held up by the file write
+                config = copy.deepcopy(self.config)
+            self._save_config(config)
     
     def reload(self):
         """Reload configuration from file"""
-        self.config = self._load_config()
+        self.flush()
+        config = self._load_config()
+        with self._save_lock:
+            self.config = config
+            self._flat_cache = self._flatten(config)
         logger.info("Configuration reloaded")
     
     def validate(self) -> bool:
@@ -184,7 +264,7 @@ class Settings:
         """Export configuration to file"""
         try:
             with open(filepath, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(self.config, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
             logger.info(f"Configuration exported to {filepath}")
         except Exception as e:
             logger.error(f"Failed to export config: {e}")
\ No newline at end of file
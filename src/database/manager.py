@@ -1,14 +1,39 @@
 import os
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from sqlalchemy import create_engine, func, and_, or_
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event, func, and_, or_, tuple_, case, select, text
+from sqlalchemy.orm import sessionmaker, selectinload, Session
 from sqlalchemy.exc import SQLAlchemyError
 from loguru import logger
 
 from database.models import Base, Player, PlayerStats, Hand, HandAction, Session as PokerSession
 
+# Players remembered by get_or_create_player; a session only sees a few dozen
+_PLAYER_CACHE_SIZE = 4096
+# Cached players still get last_seen written, at most this often (seconds)
+_LAST_SEEN_INTERVAL = 60.0
+
+# Trigram index over usernames, kept in step with the players table by triggers
+_PLAYER_FTS_DDL = (
+    "CREATE VIRTUAL TABLE player_fts USING fts5("
+    "username, content='players', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS player_fts_ai AFTER INSERT ON players BEGIN "
+    "INSERT INTO player_fts(rowid, username) VALUES (new.id, new.username); END",
+    "CREATE TRIGGER IF NOT EXISTS player_fts_ad AFTER DELETE ON players BEGIN "
+    "INSERT INTO player_fts(player_fts, rowid, username) VALUES ('delete', old.id, old.username); END",
+    "CREATE TRIGGER IF NOT EXISTS player_fts_au AFTER UPDATE OF username ON players BEGIN "
+    "INSERT INTO player_fts(player_fts, rowid, username) VALUES ('delete', old.id, old.username); "
+    "INSERT INTO player_fts(rowid, username) VALUES (new.id, new.username); END",
+    # Index players that existed before the table did
+    "INSERT INTO player_fts(player_fts) VALUES ('rebuild')",
+)
+# The trigram tokenizer can't match anything shorter
+_FTS_MIN_PATTERN = 3
+
 
 class DatabaseManager:
     def __init__(self, db_path: str = "data/poker.db"):
@@ -16,11 +41,58 @@ class DatabaseManager:
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
+        # Pooled connections are handed to whichever thread opens a session
+        self.engine = create_engine(
+            f'sqlite:///{db_path}', echo=False,
+            connect_args={'check_same_thread': False}
+        )
+        event.listen(self.engine, "connect", self._set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
+        self._ensure_indexes()
+        self._player_fts = self._ensure_player_search()
         self.SessionLocal = sessionmaker(bind=self.engine)
+        # (username, site) -> [player column values, monotonic time last_seen
+        # was written], most recent last
+        self._player_cache: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._player_cache_lock = threading.Lock()
         logger.info(f"Database initialized at {db_path}")
     
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+        """WAL with NORMAL sync: commits skip most fsyncs and HUD reads don't block writes"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+    
+    def _ensure_indexes(self):
+        """Add indexes declared after a database file was first created"""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(self.engine, checkfirst=True)
+                except SQLAlchemyError as e:
+                    # e.g. duplicate players left over from before the unique index
+                    logger.warning(f"Could not create index {index.name}: {e}")
+    
+    def _ensure_player_search(self) -> bool:
+        """Create the username search index if missing; False when FTS5 is unavailable"""
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='player_fts'"
+                )).first()
+                if not exists:
+                    for statement in _PLAYER_FTS_DDL:
+                        conn.execute(text(statement))
+            return True
+        except SQLAlchemyError as e:
+            logger.warning(f"Player search index unavailable, using LIKE scans: {e}")
+            return False
+    
     @contextmanager
     def get_session(self):
         """Context manager for database sessions"""
@@ -37,10 +109,38 @@ class DatabaseManager:
     
     # Player Management
     def get_or_create_player(self, username: str, site: str, is_hero: bool = False) -> Player:
-        """Get existing player or create new one"""
+        """
+        Get existing player or create new one
+        
+        Returns a detached Player. Repeat calls for a cached player skip the
+        lookup and write last_seen at most every _LAST_SEEN_INTERVAL seconds.
+        """
         if not username:
             raise ValueError("Username cannot be None or empty")
         
+        key = (username, site)
+        now = time.monotonic()
+        with self._player_cache_lock:
+            entry = self._player_cache.get(key)
+            if entry is not None:
+                self._player_cache.move_to_end(key)
+                columns = dict(entry[0])
+                touch = now - entry[1] >= _LAST_SEEN_INTERVAL
+                if touch:
+                    entry[1] = now
+        
+        if entry is not None:
+            if touch:
+                columns['last_seen'] = datetime.utcnow()
+                with self.get_session() as session:
+                    session.query(Player).filter_by(id=columns['id']).update(
+                        {Player.last_seen: columns['last_seen']}, synchronize_session=False
+                    )
+                with self._player_cache_lock:
+                    entry[0]['last_seen'] = columns['last_seen']
+            # A copy per caller, so nobody can change what the cache holds
+            return Player(**columns)
+        
         session = self.SessionLocal()
         try:
             player = session.query(Player).filter_by(
@@ -66,24 +166,27 @@ class DatabaseManager:
                 session.commit()
                 session.refresh(player)
             
-            # Create a detached copy with the needed attributes
-            player_dict = {
-                'id': player.id,
-                'username': player.username,
-                'site': player.site,
-                'is_hero': player.is_hero
-            }
+            # refresh() loaded every column, so the instance stays usable detached
+            session.expunge(player)
             session.close()
             
-            # Return a new instance with the data
-            result = Player(**player_dict)
-            result.id = player_dict['id']
-            return result
+            self._remember_player(player, now)
+            return player
         except Exception as e:
             session.rollback()
             session.close()
             raise e
     
+    def _remember_player(self, player: Player, touched: float):
+        """Cache a player's column values, evicting the least recently used"""
+        key = (player.username, player.site)
+        columns = {column.key: getattr(player, column.key) for column in Player.__table__.columns}
+        with self._player_cache_lock:
+            self._player_cache[key] = [columns, touched]
+            self._player_cache.move_to_end(key)
+            while len(self._player_cache) > _PLAYER_CACHE_SIZE:
+                self._player_cache.popitem(last=False)
+    
     def update_player_stats(self, player_id: int, stats_update: Dict[str, Any]):
         """Update player statistics"""
         with self.get_session() as session:
@@ -169,43 +272,79 @@ class DatabaseManager:
     
     def save_hand_actions(self, hand_id: int, actions: List[Dict[str, Any]]):
         """Save hand actions"""
+        if not actions:
+            return
+        
+        pairs = {(a['username'], a['site']) for a in actions}
+        if any(not username for username, _ in pairs):
+            raise ValueError("Username cannot be None or empty")
+        
         with self.get_session() as session:
-            for action_data in actions:
-                # Get or create player
-                player = self.get_or_create_player(
-                    action_data['username'],
-                    action_data['site']
-                )
-                
-                action = HandAction(
-                    hand_id=hand_id,
-                    player_id=player.id,
-                    position=action_data.get('position'),
-                    hole_cards=action_data.get('hole_cards'),
-                    street=action_data['street'],
-                    action_number=action_data.get('action_number'),
-                    action_type=action_data['action_type'],
-                    amount=action_data.get('amount', 0),
-                    pot_size_before=action_data.get('pot_size_before'),
-                    stack_before=action_data.get('stack_before'),
-                    stack_after=action_data.get('stack_after')
-                )
-                session.add(action)
+            # Resolve every player in the hand with one query instead of a
+            # get_or_create_player round-trip per action
+            player_ids = {
+                (username, site): player_id
+                for player_id, username, site in session.query(
+                    Player.id, Player.username, Player.site
+                ).filter(tuple_(Player.username, Player.site).in_(pairs))
+            }
+            if player_ids:
+                session.query(Player).filter(
+                    Player.id.in_(player_ids.values())
+                ).update({Player.last_seen: datetime.utcnow()}, synchronize_session=False)
+            
+            new_players = [
+                Player(username=username, site=site, is_hero=False)
+                for username, site in pairs if (username, site) not in player_ids
+            ]
+            if new_players:
+                session.bulk_save_objects(new_players, return_defaults=True)
+                session.bulk_save_objects([PlayerStats(player_id=p.id) for p in new_players])
+                for player in new_players:
+                    player_ids[(player.username, player.site)] = player.id
+                    logger.info(f"Created new player: {player.username} on {player.site}")
+            
+            session.bulk_insert_mappings(HandAction, [
+                {
+                    'hand_id': hand_id,
+                    'player_id': player_ids[(action_data['username'], action_data['site'])],
+                    'position': action_data.get('position'),
+                    'hole_cards': action_data.get('hole_cards'),
+                    'street': action_data['street'],
+                    'action_number': action_data.get('action_number'),
+                    'action_type': action_data['action_type'],
+                    'amount': action_data.get('amount', 0),
+                    'pot_size_before': action_data.get('pot_size_before'),
+                    'stack_before': action_data.get('stack_before'),
+                    'stack_after': action_data.get('stack_after')
+                }
+                for action_data in actions
+            ])
             
             session.commit()
             logger.debug(f"Saved {len(actions)} actions for hand_id={hand_id}")
     
     def get_recent_hands(self, limit: int = 100, player_id: Optional[int] = None) -> List[Hand]:
-        """Get recent hands, optionally filtered by player"""
+        """
+        Get recent hands, optionally filtered by player
+        
+        Each hand's actions and their players are prefetched and the hands are
+        returned detached, so `hand.actions` and `action.player` are readable
+        after the session closes without further queries.
+        """
         with self.get_session() as session:
-            query = session.query(Hand).order_by(Hand.timestamp.desc())
+            query = session.query(Hand).options(
+                selectinload(Hand.actions).selectinload(HandAction.player)
+            ).order_by(Hand.timestamp.desc())
             
             if player_id:
                 query = query.join(HandAction).filter(
                     HandAction.player_id == player_id
                 )
             
-            return query.limit(limit).all()
+            hands = query.limit(limit).all()
+            session.expunge_all()
+            return hands
     
     # Session Management
     def create_session(self, site: str, hero_username: str) -> PokerSession:
@@ -233,8 +372,9 @@ class DatabaseManager:
                 poker_session.end_time = datetime.utcnow()
                 
                 # Calculate session statistics
-                hands = session.query(Hand).filter_by(session_id=session_id).all()
-                poker_session.hands_played = len(hands)
+                poker_session.hands_played = session.query(
+                    func.count(Hand.id)
+                ).filter(Hand.session_id == session_id).scalar()
                 
                 # Calculate profit/loss and winrate
                 poker_session.calculate_winrate()
@@ -246,42 +386,27 @@ class DatabaseManager:
     def calculate_player_stats_from_hands(self, player_id: int):
         """Recalculate player statistics from hand history"""
         with self.get_session() as session:
-            # Get all actions for this player
-            actions = session.query(HandAction).filter_by(player_id=player_id).all()
+            # One row per hand with a 0/1 flag per stat, summed in the same
+            # query so no HandAction rows are loaded
+            preflop = HandAction.street == 'preflop'
+            per_hand = session.query(
+                func.max(case((and_(preflop, HandAction.action_type.in_(['call', 'bet', 'raise'])), 1), else_=0)).label('vpip'),
+                func.max(case((and_(preflop, HandAction.action_type.in_(['bet', 'raise'])), 1), else_=0)).label('pfr'),
+                func.max(case((and_(preflop, HandAction.action_type == 'raise', HandAction.action_number > 2), 1), else_=0)).label('three_bet')
+            ).filter(HandAction.player_id == player_id).group_by(HandAction.hand_id).subquery()
+            
+            total_hands, vpip_hands, pfr_hands, three_bet_hands = session.query(
+                func.count(),
+                func.coalesce(func.sum(per_hand.c.vpip), 0),
+                func.coalesce(func.sum(per_hand.c.pfr), 0),
+                func.coalesce(func.sum(per_hand.c.three_bet), 0)
+            ).select_from(per_hand).one()
             
-            if not actions:
+            if not total_hands:
                 return
             
-            # Initialize counters
-            total_hands = len(set(a.hand_id for a in actions))
-            vpip_hands = 0
-            pfr_hands = 0
-            three_bet_hands = 0
             three_bet_opportunities = 0
             
-            # Group actions by hand
-            hands_actions = {}
-            for action in actions:
-                if action.hand_id not in hands_actions:
-                    hands_actions[action.hand_id] = []
-                hands_actions[action.hand_id].append(action)
-            
-            # Analyze each hand
-            for hand_id, hand_actions in hands_actions.items():
-                preflop_actions = [a for a in hand_actions if a.street == 'preflop']
-                
-                # VPIP: Voluntarily put money in pot (call, bet, raise preflop)
-                if any(a.action_type in ['call', 'bet', 'raise'] for a in preflop_actions):
-                    vpip_hands += 1
-                
-                # PFR: Preflop raise
-                if any(a.action_type in ['bet', 'raise'] for a in preflop_actions):
-                    pfr_hands += 1
-                
-                # 3-bet detection (simplified)
-                if any(a.action_type == 'raise' and a.action_number and a.action_number > 2 for a in preflop_actions):
-                    three_bet_hands += 1
-            
             # Update stats
             stats_update = {
                 'hands_played': total_hands,
@@ -303,7 +428,15 @@ class DatabaseManager:
             query = session.query(Player)
             
             if username_pattern:
-                query = query.filter(Player.username.like(f'%{username_pattern}%'))
+                if self._player_fts and len(username_pattern) >= _FTS_MIN_PATTERN:
+                    # A quoted trigram phrase matches the same substrings as LIKE
+                    phrase = '"' + username_pattern.replace('"', '""') + '"'
+                    matches = select(text("rowid")).select_from(text("player_fts")).where(
+                        text("player_fts MATCH :phrase")
+                    ).params(phrase=phrase)
+                    query = query.filter(Player.id.in_(matches))
+                else:
+                    query = query.filter(Player.username.like(f'%{username_pattern}%'))
             
             if min_hands > 0:
                 query = query.filter(Player.total_hands >= min_hands)
@@ -350,12 +483,19 @@ class DatabaseManager:
     def get_database_stats(self) -> Dict[str, Any]:
         """Get overall database statistics"""
         with self.get_session() as session:
+            # Every figure as a scalar subquery of one SELECT
+            row = session.execute(select(
+                select(func.count(Player.id)).scalar_subquery(),
+                select(func.count(Hand.id)).scalar_subquery(),
+                select(func.count(PokerSession.id)).scalar_subquery(),
+                select(func.count(Player.id)).where(Player.total_hands >= 100).scalar_subquery(),
+                select(func.max(Hand.timestamp)).scalar_subquery()
+            )).one()
+            
             return {
-                'total_players': session.query(Player).count(),
-                'total_hands': session.query(Hand).count(),
-                'total_sessions': session.query(PokerSession).count(),
-                'players_with_100_hands': session.query(Player).filter(
-                    Player.total_hands >= 100
-                ).count(),
-                'last_hand_time': session.query(func.max(Hand.timestamp)).scalar()
+                'total_players': row[0],
+                'total_hands': row[1],
+                'total_sessions': row[2],
+                'players_with_100_hands': row[3],
+                'last_hand_time': row[4]
             }
\ No newline at end of file
@@ -1,16 +1,23 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 import json
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Generic JSON (text) on SQLite, binary JSONB on PostgreSQL
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class Player(Base):
     __tablename__ = 'players'
+    __table_args__ = (
+        Index('ix_player_username_site', 'username', 'site', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     username = Column(String(100), nullable=False)
@@ -30,6 +37,9 @@ class Player(Base):
 
 class PlayerStats(Base):
     __tablename__ = 'player_stats'
+    __table_args__ = (
+        Index('ix_playerstats_player', 'player_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey('players.id'), nullable=False)
@@ -60,7 +70,7 @@ class PlayerStats(Base):
     ww_sf = Column(Float, default=0.0)  # Won When Saw Flop
     
     # Positional stats (stored as JSON)
-    positional_stats = Column(JSON, default={})
+    positional_stats = Column(JSONType, default={})
     
     # Sample sizes
     hands_played = Column(Integer, default=0)
@@ -92,6 +102,11 @@ class PlayerStats(Base):
 
 class Hand(Base):
     __tablename__ = 'hands'
+    __table_args__ = (
+        # Containment (@>) queries over parsed hands; PostgreSQL only
+        Index('ix_hands_parsed_gin', 'parsed_data', postgresql_using='gin',
+              postgresql_ops={'parsed_data': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
     
     id = Column(Integer, primary_key=True)
     hand_number = Column(String(50), unique=True, nullable=False)
@@ -111,7 +126,7 @@ class Hand(Base):
     
     # Hand data
     raw_history = Column(Text)  # Original hand history text
-    parsed_data = Column(JSON)  # Parsed hand data in JSON format
+    parsed_data = Column(JSONType)  # Parsed hand data in JSON format
     
     # Board cards
     flop = Column(String(10))
@@ -121,7 +136,7 @@ class Hand(Base):
     # Results
     pot_size = Column(Float)
     rake = Column(Float)
-    winner_ids = Column(JSON)  # List of winner player IDs
+    winner_ids = Column(JSONType)  # List of winner player IDs
     
     # Relationships
     actions = relationship("HandAction", back_populates="hand", cascade="all, delete-orphan")
@@ -134,6 +149,12 @@ class Hand(Base):
 
 class HandAction(Base):
     __tablename__ = 'hand_actions'
+    __table_args__ = (
+        # Stats recalculation scans one player's actions grouped by hand;
+        # the same index serves plain player_id lookups
+        Index('ix_handaction_player_hand', 'player_id', 'hand_id'),
+        Index('ix_handaction_hand', 'hand_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     hand_id = Column(Integer, ForeignKey('hands.id'), nullable=False)
@@ -186,7 +207,7 @@ class Session(Base):
     bb_per_100 = Column(Float, default=0)
     
     # Stats
-    session_stats = Column(JSON, default={})
+    session_stats = Column(JSONType, default={})
     
     # Relationships
     hands = relationship("Hand", back_populates="session")
@@ -208,12 +229,12 @@ class HUDConfig(Base):
     hud_software = Column(String(50))  # PT4, HM3, etc.
     
     # Screen regions for OCR (stored as JSON)
-    stat_regions = Column(JSON)  # {"vpip": {"x": 100, "y": 200, "width": 50, "height": 20}, ...}
-    player_name_regions = Column(JSON)
+    stat_regions = Column(JSONType)  # {"vpip": {"x": 100, "y": 200, "width": 50, "height": 20}, ...}
+    player_name_regions = Column(JSONType)
     
     # OCR settings
     ocr_engine = Column(String(20), default='pytesseract')
-    preprocessing = Column(JSON, default=['grayscale', 'threshold'])
+    preprocessing = Column(JSONType, default=['grayscale', 'threshold'])
     confidence_threshold = Column(Float, default=0.85)
     
     # Update frequency
@@ -1,10 +1,24 @@
 """
 Detection module for poker table elements using computer vision
 """
+import importlib
 
-from .yolo_detector import YOLODetector
-from .paddle_reader import PaddleReader
-from .card_classifier import CardClassifier
 from .hand_fsm import HandStateMachine
 
-__all__ = ['YOLODetector', 'PaddleReader', 'CardClassifier', 'HandStateMachine']
\ No newline at end of file
+# The model wrappers pull in ultralytics, PaddleOCR and torch, so they load
+# on first access rather than with the package (which hand_fsm users import)
+_LAZY = {
+    'YOLODetector': '.yolo_detector',
+    'PaddleReader': '.paddle_reader',
+    'CardClassifier': '.card_classifier',
+}
+
+__all__ = ['YOLODetector', 'PaddleReader', 'CardClassifier', 'HandStateMachine']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,10 @@
 """
 Card classifier using MobileNetV3 or traditional CV
 """
+import re
+import threading
 import numpy as np
+from itertools import product
 from typing import List, Optional, Tuple, Dict
 from dataclasses import dataclass
 import cv2
@@ -9,13 +12,16 @@ from loguru import logger
 
 try:
     import torch
-    import torchvision.transforms as transforms
     from torchvision import models
     TORCH_AVAILABLE = True
 except ImportError:
     logger.warning("PyTorch not installed, using traditional CV for card detection")
     TORCH_AVAILABLE = False
 
+# A rank character in OCR output; "10" is read as T
+_RANK_RE = re.compile(r'10|[AKQJT98765432]')
+_RANK_MAP = {'10': 'T', **{rank: rank for rank in 'AKQJT98765432'}}
+
 
 @dataclass
 class Card:
@@ -32,18 +38,34 @@ class Card:
 class CardClassifier:
     """Classify playing cards from images"""
     
+    # Network input size and ImageNet normalization, scaled for uint8 pixels
+    INPUT_SIZE = (224, 224)
+    MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32) * 255
+    INV_STD = 1.0 / (np.array([0.229, 0.224, 0.225], dtype=np.float32) * 255)
+    
     RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
     SUITS = ['s', 'h', 'd', 'c']  # spades, hearts, diamonds, clubs
+    # Network output index -> (rank, suit); classes are rank-major
+    CLASS_CARDS = list(product(RANKS, SUITS))
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, quantize: bool = False):
         """
         Initialize card classifier
         
         Args:
             model_path: Path to trained model weights
+            quantize: Run the network's Linear layers in int8 on the CPU
         """
         self.model = None
         self.model_path = model_path
+        self.quantize = quantize
+        self.device = None
+        # Uncompiled model kept while torch.compile's version is in use
+        self._eager_model = None
+        # PaddleOCR for the traditional rank fallback, loaded on first use;
+        # False once loading has failed
+        self._ocr = None
+        self._ocr_lock = threading.Lock()
         self.transform = None
         
         if TORCH_AVAILABLE:
@@ -55,13 +77,7 @@ class CardClassifier:
         """Initialize neural network classifier"""
         try:
             # Setup image transforms
-            self.transform = transforms.Compose([
-                transforms.ToPILImage(),
-                transforms.Resize((224, 224)),
-                transforms.ToTensor(),
-                transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                                   std=[0.229, 0.224, 0.225])
-            ])
+            self.transform = self._preprocess
             
             if self.model_path:
                 # Load custom trained model
@@ -78,11 +94,58 @@ class CardClassifier:
                 )
                 self.model.eval()
                 logger.warning("Using pretrained MobileNetV3 - train custom model for better accuracy")
+            
+            # Quantized kernels are CPU-only
+            use_cuda = torch.cuda.is_available() and not self.quantize
+            self.device = torch.device('cuda' if use_cuda else 'cpu')
+            if self.quantize:
+                self._quantize_model()
+            elif use_cuda:
+                self._prepare_gpu_model()
                 
         except Exception as e:
             logger.error(f"Failed to init neural classifier: {e}")
             self.model = None
     
+    def _prepare_gpu_model(self):
+        """Move the model to the GPU in FP16 and compile it where supported"""
+        self.model = self.model.to(self.device).half()
+        if hasattr(torch, 'compile'):
+            self._eager_model = self.model
+            self.model = torch.compile(self.model, mode='reduce-overhead')
+        logger.info(f"Card classifier on {torch.cuda.get_device_name(self.device)} (FP16)")
+    
+    def _preprocess(self, image: np.ndarray) -> "torch.Tensor":
+        """
+        Resize and normalize an RGB card crop into a CHW float tensor
+        
+        Matches ToPILImage/Resize/ToTensor/Normalize up to interpolation:
+        area averaging stands in for PIL's antialiased bilinear when shrinking,
+        plain bilinear (what PIL does too) when enlarging
+        """
+        width, height = self.INPUT_SIZE
+        shrinking = image.shape[1] > width or image.shape[0] > height
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+        resized = cv2.resize(image, self.INPUT_SIZE, interpolation=interpolation)
+        pixels = resized.astype(np.float32)
+        pixels -= self.MEAN
+        pixels *= self.INV_STD
+        return torch.from_numpy(np.ascontiguousarray(pixels.transpose(2, 0, 1)))
+    
+    def _quantize_model(self):
+        """
+        Swap the model for a dynamically quantized int8 copy
+        
+        Dynamic quantization covers Linear layers only; the convolutions stay
+        FP32, so the transform pipeline is unchanged.
+        """
+        engines = torch.backends.quantized.supported_engines
+        torch.backends.quantized.engine = 'fbgemm' if 'fbgemm' in engines else 'qnnpack'
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info(f"Quantized card model to int8 ({torch.backends.quantized.engine})")
+    
     def classify_card(self, image: np.ndarray) -> Optional[Card]:
         """
         Classify a single card image
@@ -108,37 +171,46 @@ class CardClassifier:
         Returns:
             Card or None
         """
+        return self._classify_neural_batch([image])[0]
+    
+    def _classify_neural_batch(self, images: List[np.ndarray]) -> List[Optional[Card]]:
+        """
+        Classify several card images with one forward pass
+        
+        Args:
+            images: Card images
+            
+        Returns:
+            Card or None for each image
+        """
+        results = [None] * len(images)
         try:
             # Preprocess
-            input_tensor = self.transform(image).unsqueeze(0)
+            batch = torch.stack([self.transform(image) for image in images])
+            if self.device.type == 'cuda':
+                batch = batch.to(self.device, non_blocking=True).half()
             
             # Inference
-            with torch.no_grad():
-                output = self.model(input_tensor)
-                probabilities = torch.nn.functional.softmax(output[0], dim=0)
-                
-            # Get top prediction
-            confidence, idx = torch.max(probabilities, 0)
-            confidence = float(confidence)
-            idx = int(idx)
+            with torch.inference_mode():
+                output = self.model(batch)
+                probabilities = torch.nn.functional.softmax(output, dim=1)
+                confidences, indices = probabilities.max(dim=1)
             
-            # Convert index to rank and suit
-            rank_idx = idx // 4
-            suit_idx = idx % 4
-            
-            if confidence > 0.5:  # Minimum confidence threshold
-                card = Card(
-                    rank=self.RANKS[rank_idx],
-                    suit=self.SUITS[suit_idx],
-                    confidence=confidence
-                )
-                logger.debug(f"Neural classifier detected: {card}")
-                return card
+            for i, (confidence, idx) in enumerate(zip(confidences.tolist(), indices.tolist())):
+                if confidence > 0.5:  # Minimum confidence threshold
+                    rank, suit = self.CLASS_CARDS[idx]
+                    results[i] = Card(rank=rank, suit=suit, confidence=confidence)
+                    logger.debug(f"Neural classifier detected: {results[i]}")
                 
         except Exception as e:
+            if self._eager_model is not None:
+                # Compilation happens on the first call; fall back to eager mode
+                logger.warning(f"Compiled card model failed, running it uncompiled: {e}")
+                self.model, self._eager_model = self._eager_model, None
+                return self._classify_neural_batch(images)
             logger.error(f"Neural classification failed: {e}")
             
-        return None
+        return results
     
     def _classify_traditional(self, image: np.ndarray) -> Optional[Card]:
         """
@@ -190,17 +262,15 @@ class CardClassifier:
         
         # Use OCR to detect rank characters
         try:
-            from paddleocr import PaddleOCR
-            ocr = PaddleOCR(use_angle_cls=False, lang='en', show_log=False)
-            result = ocr.ocr(gray_image, cls=False)
+            ocr = self._get_ocr()
+            result = ocr.ocr(gray_image, cls=False) if ocr else None
             
             if result and result[0]:
                 for line in result[0]:
-                    text = line[1][0].upper()
                     # Check if text is a valid rank
-                    for rank in self.RANKS:
-                        if rank in text or (rank == 'T' and '10' in text):
-                            return rank
+                    match = _RANK_RE.search(line[1][0].upper())
+                    if match:
+                        return _RANK_MAP[match.group()]
                             
         except:
             pass
@@ -218,6 +288,19 @@ class CardClassifier:
         else:
             return 'A'  # Simple pattern
     
+    def _get_ocr(self):
+        """The shared PaddleOCR instance, or None when it can't be loaded"""
+        if self._ocr is None:
+            with self._ocr_lock:
+                if self._ocr is None:
+                    try:
+                        from paddleocr import PaddleOCR
+                        self._ocr = PaddleOCR(use_angle_cls=False, lang='en', show_log=False)
+                    except Exception as e:
+                        logger.warning(f"PaddleOCR unavailable for card ranks: {e}")
+                        self._ocr = False
+        return self._ocr or None
+    
     def _is_red_suit(self, image: np.ndarray) -> bool:
         """
         Check if card has red suit (hearts/diamonds)
@@ -230,11 +313,13 @@ class CardClassifier:
         """
         # Extract red channel
         if len(image.shape) == 3:
-            red_channel = image[:, :, 0]
-            other_channels = (image[:, :, 1] + image[:, :, 2]) / 2
+            # Suit colour is uniform, so every 4th pixel each way is plenty
+            sample = image[::4, ::4]
+            red_channel = sample[:, :, 0].astype(np.int16)
+            other_channels = sample[:, :, 1].astype(np.int16) + sample[:, :, 2]
             
-            # Check if red dominates
-            red_dominance = np.mean(red_channel > other_channels)
+            # Check if red dominates (2r > g + b, i.e. r above the g/b mean)
+            red_dominance = np.count_nonzero(red_channel * 2 > other_channels) / red_channel.size
             return red_dominance > 0.3
             
         return False
@@ -296,12 +381,11 @@ class CardClassifier:
         Returns:
             List of Card objects (None for failed classifications)
         """
-        results = []
-        for image in images:
-            card = self.classify_card(image)
-            results.append(card)
-            
-        return results
+        if not images:
+            return []
+        if TORCH_AVAILABLE and self.model is not None:
+            return self._classify_neural_batch(images)
+        return [self._classify_traditional(image) for image in images]
     
     def detect_cards_in_region(self, image: np.ndarray) -> List[Tuple[Card, Tuple[int, int, int, int]]]:
         """
@@ -313,22 +397,46 @@ class CardClassifier:
         Returns:
             List of (Card, bbox) tuples
         """
-        cards = []
-        
         # Find card-like regions
         card_regions = self._find_card_regions(image)
+        card_images = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in card_regions]
         
-        for bbox in card_regions:
-            x1, y1, x2, y2 = bbox
-            card_image = image[y1:y2, x1:x2]
-            
-            card = self.classify_card(card_image)
-            if card:
-                cards.append((card, bbox))
+        cards = [
+            (card, bbox)
+            for card, bbox in zip(self.classify_multiple(card_images), card_regions)
+            if card
+        ]
                 
         logger.debug(f"Found {len(cards)} cards in region")
         return cards
     
+    def detect_batch(self, images: List[np.ndarray]) -> List[List[Tuple[Card, Tuple[int, int, int, int]]]]:
+        """
+        detect_cards_in_region for several regions, e.g. the board and the
+        hole cards, with every card found classified in one classify_multiple call
+        
+        Args:
+            images: Region images
+            
+        Returns:
+            One list of (Card, bbox) tuples per image
+        """
+        owners, card_images, boxes = [], [], []
+        for index, image in enumerate(images):
+            for x1, y1, x2, y2 in self._find_card_regions(image):
+                owners.append(index)
+                card_images.append(image[y1:y2, x1:x2])
+                boxes.append((x1, y1, x2, y2))
+        
+        results = [[] for _ in images]
+        if card_images:
+            for index, card, bbox in zip(owners, self.classify_multiple(card_images), boxes):
+                if card:
+                    results[index].append((card, bbox))
+        
+        logger.debug(f"Found {sum(map(len, results))} cards in {len(images)} regions")
+        return results
+    
     def _find_card_regions(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """
         Find potential card regions in image
@@ -339,30 +447,23 @@ class CardClassifier:
         Returns:
             List of bounding boxes (x1, y1, x2, y2)
         """
-        regions = []
-        
         # Convert to grayscale
         gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         
-        # Find rectangular contours
-        edges = cv2.Canny(gray, 50, 150)
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Card faces are the bright blobs; one labelling pass gives every
+        # blob's bounding box
+        _, binary = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        x, y, w, h = stats[1:, :4].T
         
         height, width = image.shape[:2]
         
-        for contour in contours:
-            # Get bounding rectangle
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Check if rectangle could be a card
-            # Cards have aspect ratio around 0.7 (width/height)
-            if w > 0 and h > 0:
-                aspect_ratio = w / h
-                
-                # Check aspect ratio and minimum size
-                if (0.5 < aspect_ratio < 0.9 and 
-                    w > width * 0.03 and h > height * 0.05):
-                    
-                    regions.append((x, y, x + w, y + h))
-                    
-        return regions
\ No newline at end of file
+        # Cards have aspect ratio around 0.7 (width/height) and a minimum size
+        aspect_ratio = w / h
+        keep = ((aspect_ratio > 0.5) & (aspect_ratio < 0.9) &
+                (w > width * 0.03) & (h > height * 0.05))
+        
+        # Left to right, the order cards are dealt onto the board
+        boxes = np.column_stack((x, y, x + w, y + h))[keep]
+        boxes = boxes[np.argsort(boxes[:, 0], kind='stable')]
+        return [tuple(box) for box in boxes.tolist()]
\ No newline at end of file
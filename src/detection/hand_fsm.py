@@ -97,6 +97,9 @@ class HandStateMachine:
         self.last_community_cards = []
         self.last_pot_size = 0.0
         self.hand_counter = 0
+        # Hand IDs are this per-session prefix plus the counter, so starting
+        # a hand doesn't format a timestamp
+        self._session_prefix = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         logger.info("Hand FSM initialized")
     
@@ -188,7 +191,7 @@ class HandStateMachine:
             hero_cards: Hero's hole cards
         """
         self.hand_counter += 1
-        hand_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.hand_counter}"
+        hand_id = f"{self._session_prefix}_{self.hand_counter}"
         
         self.current_hand = HandData(
             hand_id=hand_id,
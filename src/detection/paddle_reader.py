@@ -1,6 +1,7 @@
 """
 PaddleOCR reader for extracting text from poker table
 """
+import threading
 import numpy as np
 from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
@@ -36,6 +37,8 @@ class PaddleReader:
         self.ocr = None
         self.use_gpu = use_gpu
         self.lang = lang
+        # A PaddleOCR predictor isn't safe to call from several threads at once
+        self._ocr_lock = threading.Lock()
         
         self._init_ocr()
         
@@ -44,6 +47,8 @@ class PaddleReader:
             'money': re.compile(r'[\$€£]?\s*([0-9,]+\.?[0-9]*)\s*[kKmM]?'),
             'username': re.compile(r'^[A-Za-z0-9_\-]{3,20}$'),
             'action': re.compile(r'(fold|check|call|raise|bet|all[\s\-]?in)', re.IGNORECASE),
+            # Words that rule a line out as a username
+            'not_username': re.compile(r'fold|call|raise|bet|pot|all', re.IGNORECASE),
             'cards': re.compile(r'([AKQJT2-9])[♠♥♦♣schd]', re.IGNORECASE)
         }
     
@@ -72,6 +77,21 @@ class PaddleReader:
             logger.error(f"Failed to initialize PaddleOCR: {e}")
             self.ocr = None
     
+    def warmup(self):
+        """
+        Run one throwaway recognition so model loading and kernel selection
+        happen now rather than on the first table frame
+        """
+        if self.ocr is None:
+            return
+        
+        try:
+            with self._ocr_lock:
+                self.ocr.ocr(np.zeros((32, 128, 3), dtype=np.uint8), cls=True)
+            logger.debug("PaddleOCR warmed up")
+        except Exception as e:
+            logger.warning(f"PaddleOCR warm-up failed: {e}")
+    
     def read_text(self, image: np.ndarray, preprocess: bool = True) -> List[TextResult]:
         """
         Read all text from image
@@ -86,8 +106,6 @@ class PaddleReader:
         if self.ocr is None:
             return self._fallback_read(image)
         
-        results = []
-        
         try:
             # Preprocess if requested
             if preprocess:
@@ -96,30 +114,10 @@ class PaddleReader:
                 processed = image
             
             # Run OCR
-            ocr_results = self.ocr.ocr(processed, cls=True)
-            
-            if not ocr_results or not ocr_results[0]:
-                return results
+            with self._ocr_lock:
+                ocr_results = self.ocr.ocr(processed, cls=True)
             
-            # Parse results
-            for line in ocr_results[0]:
-                if len(line) >= 2:
-                    bbox = line[0]
-                    text, confidence = line[1]
-                    
-                    # Convert bbox to x1,y1,x2,y2
-                    x1 = int(min(p[0] for p in bbox))
-                    y1 = int(min(p[1] for p in bbox))
-                    x2 = int(max(p[0] for p in bbox))
-                    y2 = int(max(p[1] for p in bbox))
-                    
-                    result = TextResult(
-                        text=text.strip(),
-                        confidence=confidence,
-                        bbox=(x1, y1, x2, y2)
-                    )
-                    results.append(result)
-                    
+            results = self._parse_ocr_lines(ocr_results)
             logger.debug(f"PaddleOCR found {len(results)} text regions")
             
         except Exception as e:
@@ -128,6 +126,104 @@ class PaddleReader:
             
         return results
     
+    def read_batch(self, images: List[np.ndarray], preprocess: bool = True) -> List[List[TextResult]]:
+        """
+        Read text from several crops with a single PaddleOCR inference
+        
+        The crops are stacked into one canvas, separated by blank bands, so
+        detection and recognition run once per frame instead of once per crop.
+        Boxes are mapped back into each crop's own coordinates.
+        
+        Args:
+            images: Crops (RGB or grayscale), e.g. the pot and every player box
+            preprocess: Whether to preprocess each crop
+            
+        Returns:
+            Text results per input image, in input order
+        """
+        if not images:
+            return []
+        if self.ocr is None:
+            return [self._fallback_read(image) for image in images]
+        
+        try:
+            crops = [self._preprocess_for_text(image) if preprocess else image for image in images]
+            canvas, offsets = self._stack_crops(crops)
+            
+            with self._ocr_lock:
+                ocr_results = self.ocr.ocr(canvas, cls=True)
+            
+            batch = [[] for _ in crops]
+            for result in self._parse_ocr_lines(ocr_results):
+                x1, y1, x2, y2 = result.bbox
+                center_y = (y1 + y2) // 2
+                # Last crop starting at or above the line's centre owns it
+                index = int(np.searchsorted(offsets, center_y, side='right')) - 1
+                if index < 0 or center_y >= offsets[index] + crops[index].shape[0]:
+                    continue  # Fell in a separator band
+                top = int(offsets[index])
+                result.bbox = (x1, y1 - top, x2, y2 - top)
+                batch[index].append(result)
+            
+            logger.debug(f"PaddleOCR batch of {len(crops)} crops found "
+                         f"{sum(len(results) for results in batch)} text regions")
+            return batch
+            
+        except Exception as e:
+            logger.error(f"PaddleOCR batch failed: {e}")
+            return [self.read_text(image, preprocess) for image in images]
+    
+    @staticmethod
+    def _stack_crops(crops: List[np.ndarray], gap: int = 24) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stack crops top to bottom on one canvas
+        
+        Each crop's band (and the gap below it) is filled with the crop's own
+        median so separators read as background whatever the text polarity.
+        
+        Returns:
+            (canvas, top offset of each crop)
+        """
+        channels = max((crop.shape[2] if crop.ndim == 3 else 1) for crop in crops)
+        crops = [crop if crop.ndim == 3 or channels == 1 else np.dstack([crop] * channels)
+                 for crop in crops]
+        
+        width = max(crop.shape[1] for crop in crops)
+        heights = [crop.shape[0] for crop in crops]
+        offsets = np.cumsum([0] + [h + gap for h in heights[:-1]])
+        shape = (int(offsets[-1]) + heights[-1], width) + ((channels,) if channels > 1 else ())
+        
+        canvas = np.empty(shape, dtype=np.uint8)
+        for crop, top, height in zip(crops, offsets, heights):
+            canvas[top:top + height + gap] = np.median(crop, axis=(0, 1)).astype(np.uint8)
+            canvas[top:top + height, :crop.shape[1]] = crop
+        return canvas, offsets
+    
+    @staticmethod
+    def _parse_ocr_lines(ocr_results) -> List[TextResult]:
+        """Convert PaddleOCR's [[box points, (text, score)], ...] output to TextResults"""
+        results = []
+        if not ocr_results or not ocr_results[0]:
+            return results
+        
+        for line in ocr_results[0]:
+            if len(line) >= 2:
+                bbox = line[0]
+                text, confidence = line[1]
+                
+                # Convert bbox to x1,y1,x2,y2
+                x1 = int(min(p[0] for p in bbox))
+                y1 = int(min(p[1] for p in bbox))
+                x2 = int(max(p[0] for p in bbox))
+                y2 = int(max(p[1] for p in bbox))
+                
+                results.append(TextResult(
+                    text=text.strip(),
+                    confidence=confidence,
+                    bbox=(x1, y1, x2, y2)
+                ))
+        return results
+    
     def read_player_name(self, image: np.ndarray) -> Optional[str]:
         """
         Extract player username from image
@@ -138,8 +234,10 @@ class PaddleReader:
         Returns:
             Player name or None
         """
-        texts = self.read_text(image)
-        
+        return self.parse_player_name(self.read_text(image))
+    
+    def parse_player_name(self, texts: List[TextResult]) -> Optional[str]:
+        """Pick the player name out of text already read from a player box"""
         for text_result in texts:
             # Check if text matches username pattern
             if self.patterns['username'].match(text_result.text):
@@ -154,8 +252,7 @@ class PaddleReader:
             for t in texts:
                 text = t.text.strip()
                 # Basic filtering
-                if (3 <= len(text) <= 20 and 
-                    not any(word in text.lower() for word in ['fold', 'call', 'raise', 'bet', 'pot', 'all'])):
+                if 3 <= len(text) <= 20 and not self.patterns['not_username'].search(text):
                     candidates.append(t)
             
             if candidates:
@@ -176,8 +273,10 @@ class PaddleReader:
         Returns:
             Money amount or None
         """
-        texts = self.read_text(image)
-        
+        return self.parse_money_amount(self.read_text(image))
+    
+    def parse_money_amount(self, texts: List[TextResult]) -> Optional[float]:
+        """First money amount in text already read from a crop"""
         for text_result in texts:
             match = self.patterns['money'].search(text_result.text)
             if match:
@@ -210,9 +309,11 @@ class PaddleReader:
         Returns:
             Stack size or None
         """
+        return self.parse_stack_size(self.read_text(image))
+    
+    def parse_stack_size(self, texts: List[TextResult]) -> Optional[float]:
+        """Stack size from text already read from a player box"""
         # Stack is usually the largest number in player box
-        texts = self.read_text(image)
-        
         amounts = []
         for text_result in texts:
             match = self.patterns['money'].search(text_result.text)
@@ -38,15 +38,19 @@ class YOLODetector:
         6: 'bet_chips'
     }
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, half: bool = False):
         """
         Initialize YOLO detector
         
         Args:
-            model_path: Path to custom YOLO model, or None to use pretrained
+            model_path: Path to custom YOLO model (.pt, or a TensorRT .engine
+                from export_engine), or None to use pretrained
+            half: Run inference in FP16 on CUDA; engines keep the precision
+                they were exported with
         """
         self.model = None
         self.model_path = model_path
+        self.half = half
         
         if YOLO is None:
             logger.error("YOLO not available, install with: pip install ultralytics")
@@ -59,7 +63,7 @@ class YOLODetector:
         try:
             if self.model_path and Path(self.model_path).exists():
                 # Load custom poker-trained model
-                self.model = YOLO(self.model_path)
+                self.model = YOLO(self.model_path, task='detect')
                 logger.info(f"Loaded custom YOLO model from {self.model_path}")
             else:
                 # Use pretrained model and adapt for poker
@@ -72,6 +76,56 @@ class YOLODetector:
             logger.error(f"Failed to load YOLO model: {e}")
             self.model = None
     
+    def export_engine(self, imgsz: Tuple[int, int] = (1088, 1920), int8: bool = False,
+                      data: Optional[str] = None) -> Optional[str]:
+        """
+        Build a TensorRT engine from the loaded model and switch to it
+        
+        The table is a fixed view with a few large boxes, so reduced precision
+        costs little accuracy. Engines are tied to the GPU and TensorRT version
+        they were built with; pass the result as model_path on later runs.
+        
+        Args:
+            imgsz: Static (height, width) input size, a multiple of 32
+            int8: Build INT8 instead of FP16; needs calibration images
+            data: Dataset YAML listing calibration images (e.g. saved
+                debug_screenshots/full_table.png captures), for int8
+            
+        Returns:
+            Path of the engine, or None if the export failed
+        """
+        if self.model is None:
+            return None
+        
+        try:
+            engine_path = self.model.export(format='engine', half=not int8, int8=int8,
+                                            data=data, imgsz=list(imgsz), dynamic=False)
+        except Exception as e:
+            logger.error(f"TensorRT export failed: {e}")
+            return None
+        
+        logger.info(f"Exported {'INT8' if int8 else 'FP16'} TensorRT engine to {engine_path}")
+        self.model_path = str(engine_path)
+        self._load_model()
+        return self.model_path
+    
+    def warmup(self, shape: Tuple[int, int] = (1080, 1920)):
+        """
+        Run one throwaway inference so weight upload, kernel selection and
+        cuDNN autotuning happen now rather than on the first table frame
+        
+        Args:
+            shape: (height, width) of the frames detect() will be given
+        """
+        if self.model is None:
+            return
+        
+        try:
+            self.model(np.zeros((*shape, 3), dtype=np.uint8), half=self.half, verbose=False)
+            logger.debug(f"YOLO warmed up at {shape[1]}x{shape[0]}")
+        except Exception as e:
+            logger.warning(f"YOLO warm-up failed: {e}")
+    
     def detect(self, image: np.ndarray, confidence_threshold: float = 0.5) -> List[Detection]:
         """
         Detect poker elements in image
@@ -90,7 +144,7 @@ class YOLODetector:
         
         try:
             # Run inference
-            results = self.model(image, conf=confidence_threshold)
+            results = self.model(image, conf=confidence_threshold, half=self.half)
             
             for result in results:
                 if result.boxes is None:
@@ -162,6 +216,22 @@ class YOLODetector:
             return max(pot_detections, key=lambda d: d.confidence)
         return None
     
+    def detect_pot_and_players(self, image: np.ndarray) -> Tuple[Optional[Detection], List[Detection]]:
+        """
+        Detect the pot area and player boxes with a single inference
+        
+        Returns:
+            (highest confidence pot detection or None, player box detections)
+        """
+        pot = None
+        players = []
+        for detection in self.detect(image):
+            if detection.label == 'player_box':
+                players.append(detection)
+            elif detection.label == 'pot_area' and (pot is None or detection.confidence > pot.confidence):
+                pot = detection
+        return pot, players
+    
     def detect_table_elements(self, image: np.ndarray) -> Dict[str, List[Detection]]:
         """
         Detect all table elements organized by type
@@ -241,6 +311,13 @@ class FallbackDetector:
     
     def __init__(self):
         logger.info("Using fallback detector (traditional CV)")
+    
+    def warmup(self, shape: Tuple[int, int] = (1080, 1920)):
+        """Nothing to warm up; present so callers needn't check the detector type"""
+    
+    def detect_pot_and_players(self, image: np.ndarray) -> Tuple[Optional[Detection], List[Detection]]:
+        """Player boxes only; the pot is left to the region OCR"""
+        return None, self.detect_players(image)
         
     def detect_players(self, image: np.ndarray) -> List[Detection]:
         """
@@ -6,6 +6,14 @@ from enum import Enum
 from loguru import logger
 
 
+# Used by the card and amount helpers every site parser shares
+_CARDS_RE = re.compile(r'[AKQJT2-9][schd]')
+_AMOUNT_STRIP = str.maketrans('', '', '$€£,')
+# Positions by seats clockwise from the button
+_POSITIONS_6MAX = ("BTN", "SB", "BB", "UTG", "MP", "CO")
+_POSITIONS_9MAX = ("BTN", "SB", "BB", "UTG", "UTG+1", "MP", "MP+1", "CO", "HJ")
+
+
 class Street(Enum):
     PREFLOP = "preflop"
     FLOP = "flop"
@@ -199,13 +207,12 @@ class HandParser:
     def _parse_cards(self, cards_str: str) -> List[str]:
         """Parse card string into list of cards"""
         # Match patterns like "Ah Kd" or "AhKd"
-        cards = re.findall(r'[AKQJT2-9][schd]', cards_str)
-        return cards
+        return _CARDS_RE.findall(cards_str)
     
     def _parse_amount(self, amount_str: str) -> float:
         """Parse money amount from string"""
         # Remove currency symbols and convert to float
-        cleaned = re.sub(r'[$€£,]', '', amount_str)
+        cleaned = amount_str.translate(_AMOUNT_STRIP)
         try:
             return float(cleaned)
         except ValueError:
@@ -222,21 +229,11 @@ class HandParser:
         # Find button index
         button_idx = next((i for i, (seat, _) in enumerate(seats) if seat == hand.button_seat), 0)
         
-        # 6-max positions
-        if num_players <= 6:
-            positions_6max = ["BTN", "SB", "BB", "UTG", "MP", "CO"]
-            for i, (_, name) in enumerate(seats):
-                pos_idx = (i - button_idx) % num_players
-                if pos_idx < len(positions_6max):
-                    hand.players[name].position = positions_6max[pos_idx]
-        
-        # 9-max positions
-        else:
-            positions_9max = ["BTN", "SB", "BB", "UTG", "UTG+1", "MP", "MP+1", "CO", "HJ"]
-            for i, (_, name) in enumerate(seats):
-                pos_idx = (i - button_idx) % num_players
-                if pos_idx < len(positions_9max):
-                    hand.players[name].position = positions_9max[pos_idx]
+        positions = _POSITIONS_6MAX if num_players <= 6 else _POSITIONS_9MAX
+        for i, (_, name) in enumerate(seats):
+            pos_idx = (i - button_idx) % num_players
+            if pos_idx < len(positions):
+                hand.players[name].position = positions[pos_idx]
 
 
 class PokerStarsParser(HandParser):
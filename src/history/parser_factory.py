@@ -36,10 +36,10 @@ class GGPokerParser(HandParser):
     
     def _parse_players(self, text, hand):
         # Simplified player parsing
-        import re
+        player_re = self.patterns['player']
         for line in text.split('\n'):
             if 'Seat' in line and ':' in line:
-                match = re.search(r'Seat (\d+): (.+) \(([\d.]+)\)', line)
+                match = player_re.search(line)
                 if match:
                     from history.hand_parser import PlayerInfo
                     player = PlayerInfo(
@@ -12,7 +12,6 @@ from typing import Optional
 from loguru import logger
 import yaml
 import argparse
-from datetime import datetime
 
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -24,7 +23,7 @@ from capture.table_reader import TableReader
 from hud.hud_extractor import HUDExtractor
 from history.history_monitor import HandHistoryMonitor
 from overlay.player_hud import HUDManager, PlayerStats
-from config.settings import Settings
+from config.settings import Settings, YamlLoader
 
 
 class PokerAssistant:
@@ -37,7 +36,9 @@ class PokerAssistant:
         # Initialize components
         self.db = DatabaseManager(self.config.get('database', {}).get('path', 'data/poker.db'))
         self.screen_capture = ScreenCapture()
-        self.ocr_engine = OCREngine(self.config.get('ocr', {}).get('engine', 'pytesseract'))
+        ocr_config = self.config.get('ocr', {})
+        self.ocr_engine = OCREngine(ocr_config.get('engine', 'pytesseract'),
+                                    digit_templates=ocr_config.get('digit_templates'))
         
         # Site configuration
         self.site = self.config.get('site', 'pokerstars')
@@ -51,10 +52,15 @@ class PokerAssistant:
         )
         
         # Table reader for capturing hands from screen
+        detection_config = self.config.get('detection', {})
         self.table_reader = TableReader(
             self.screen_capture,
             self.ocr_engine,
-            self.site
+            self.site,
+            debug_enabled=self.config.get('capture', {}).get('debug_screenshots', False),
+            yolo_model=detection_config.get('yolo_model'),
+            yolo_half=detection_config.get('yolo_half', False),
+            card_int8=detection_config.get('card_int8', False)
         )
         
         # Hand history monitor
@@ -80,7 +86,7 @@ class PokerAssistant:
         """Load configuration from file"""
         if config_path and os.path.exists(config_path):
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
                 logger.info(f"Loaded configuration from {config_path}")
                 return config
         
@@ -188,8 +194,9 @@ class PokerAssistant:
             active_positions = set()
             
             # Process each player
-            for position, player_info in table_state.players.items():
-                player_name = player_info.get('name')
+            for seat_num, player_info in table_state.seated():
+                position = self.table_reader._seat_to_position(seat_num)
+                player_name = player_info.name
                 if not player_name:
                     continue
                 
@@ -202,8 +209,7 @@ class PokerAssistant:
                 category, color = self.categorize_player(player_db_stats)
                 
                 # Get position on screen
-                seat_num = self._position_to_seat(position)
-                if seat_num and seat_num in self.table_reader.seat_positions:
+                if seat_num in self.table_reader.seat_positions:
                     seat_pos = self.table_reader.seat_positions[seat_num]
                     
                     # Position HUD to the right of the player seat
@@ -284,14 +290,6 @@ class PokerAssistant:
         
         return None
     
-    def _position_to_seat(self, position):
-        """Convert position name to seat number"""
-        position_map = {
-            "BTN": 1, "SB": 2, "BB": 3,
-            "UTG": 4, "MP": 5, "CO": 6
-        }
-        return position_map.get(position)
-    
     def _create_test_hud(self):
         """Create a test HUD to verify the system is working"""
         try:
@@ -351,9 +349,16 @@ class PokerAssistant:
     
     def run_main_loop(self):
         """Main application loop"""
-        update_interval = self.config.get('capture', {}).get('update_interval', 1.0)
+        capture_config = self.config.get('capture', {})
+        update_interval = capture_config.get('update_interval', 1.0)
+        if capture_config.get('pipeline', False):
+            # Capture, YOLO and OCR overlap on background threads; the loop
+            # below just picks up the newest finished state
+            self.table_reader.start_pipeline(update_interval,
+                                             cpu_affinity=capture_config.get('cpu_affinity'))
         last_update = time.time()
         last_stats_log = time.time()
+        last_state_log = time.time()
         stats_log_interval = 30.0  # Only log stats every 30 seconds
         
         while self.is_running:
@@ -390,13 +395,11 @@ class PokerAssistant:
                             self.update_overlay_display(table_state)
                             
                             # Log current state periodically
-                            if hasattr(self, '_last_state_log'):
-                                if current_time - self._last_state_log > 10:  # Log every 10 seconds
-                                    if table_state.players:
-                                        logger.debug(f"Players detected: {list(table_state.players.keys())}")
-                                    self._last_state_log = current_time
-                            else:
-                                self._last_state_log = current_time
+                            if current_time - last_state_log > 10:  # Log every 10 seconds
+                                seats = [seat for seat, _ in table_state.seated()]
+                                if seats:
+                                    logger.debug(f"Players detected at seats: {seats}")
+                                last_state_log = current_time
                         
                         # Extract HUD stats (only if not in lobby)
                         if not self.is_in_lobby:
@@ -456,9 +459,8 @@ class PokerAssistant:
                 hand_history_dir = Path.home() / "Documents" / "BetOnline" / "HandHistory"
                 hand_history_dir.mkdir(parents=True, exist_ok=True)
                 
-                # Save to file
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = hand_history_dir / f"hand_{timestamp}.json"
+                # Save to file; hand IDs are already timestamped and unique
+                filename = hand_history_dir / f"hand_{hand_record['hand_id']}.json"
                 
                 import json
                 with open(filename, 'w') as f:
@@ -534,7 +536,9 @@ class PokerAssistant:
             self.db.end_session(self.current_session.id)
         
         # Cleanup
+        self.table_reader.cleanup()
         self.screen_capture.cleanup()
+        self.ocr_engine.cleanup()
         
         logger.info("Poker Assistant stopped")
     